@@ -1,5 +1,6 @@
 import pandas as pd
 import openai_hunter_client
+import rate_limiter
 import json
 from presets import Role, stateCorrectionMap
 from datetime import datetime
@@ -18,6 +19,8 @@ import logging
 from pathlib import Path
 from langchain.agents import create_agent
 from alberta_tools import lookup_county, query_rag
+from cache import DAY, cache, make_key, prompt_hash
+from population import _normalize_place
 
 os.environ["OPENAI_API_KEY"] = settings.openai_api_key
 
@@ -31,14 +34,28 @@ class GISContact(openai.BaseModel):
     confidence: float
 
 
+AGENT_PROMPT = "You are finding GIS manager contacts for Alberta villages. If the request already names the village's county, use it; otherwise you MUST call lookup_county first to find the county. Then call query_rag with the county name. If query_rag returns low confidence or nothing, return confidence 0 — do not search elsewhere."
+
 graph = create_agent(
     model="openai:gpt-4o-mini",
     tools=[lookup_county, query_rag],
-    system_prompt="You are finding GIS manager contacts for Alberta villages. You MUST always call lookup_county first to find the county. Then call query_rag with the county name. If query_rag returns low confidence or nothing, return confidence 0 — do not search elsewhere.",
+    system_prompt=AGENT_PROMPT,
     response_format=GISContact
 )
 
 
+def _county_contact_key(county_key):
+    """Cache key for a county's agent answer; changes when the agent prompt, RAG prompt or vector store does."""
+    return make_key(county_key, prompt_hash(AGENT_PROMPT + settings.prompt_find_in_file), settings.file_id)
+
+
+def _is_confident(info):
+    try:
+        return float(json.loads(info).get("confidence") or 0) > 0
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
 try:
     import pywinstyles
     HAS_PYWINSTYLES = True
@@ -586,6 +603,45 @@ class App:
     def run(self):
         self.root.mainloop()
 
+    def _find_gis_contact(self, value, county_results):
+        """
+        Agent answer for one village. Villages in the same county share one GIS manager, so
+        answers are memoized per county: in county_results for this run, and in the cache
+        across runs (confident answers only).
+        """
+        try:
+            county = lookup_county.invoke({"town": str(value), "state": "Alberta"})
+        except openai.APIConnectionError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"County lookup failed for {value}: {e}")
+            county = None
+        county_key = _normalize_place(county) if county else ""
+
+        if county_key in county_results:
+            self.logger.info(f"Reusing {county} contact for {value}")
+            return county_results[county_key]
+        if county_key and cache is not None:
+            hit, info = cache.get("alberta_contact", _county_contact_key(county_key))
+            if hit:
+                self.logger.info(f"Reusing cached {county} contact for {value}")
+                county_results[county_key] = info
+                return info
+
+        # The county is already resolved, so the agent goes straight to query_rag instead of paying for lookup_county again
+        request = f"Find the GIS manager for {value}, Alberta"
+        if county:
+            request += f". {value} is in {county}"
+        result = graph.invoke({
+            "messages": [{"role": "user", "content": request}]
+        })
+        info = result["messages"][-1].content
+        if county_key:
+            county_results[county_key] = info
+            if cache is not None and _is_confident(info):
+                cache.set("alberta_contact", _county_contact_key(county_key), info, settings.search_cache_ttl_days * DAY)
+        return info
+
     def _detect_columns(self, df):
         cols = {}
         self.cols = []
@@ -760,6 +816,7 @@ class App:
             state_val = "unknown"
             tag_str = ""
             stats = {"rows": 0, "files": 0, "written_files": []}
+            county_results = {}  # normalized county -> agent answer, shared by every village in that county
 
             def _write_file(complete = True):
                 #WRITE per role — timestamp at finish time to avoid collisions
@@ -958,10 +1015,7 @@ class App:
                                 ))
 
                                 try:
-                                    result = graph.invoke({
-                                        "messages": [{"role": "user", "content": f"Find the GIS manager for {value}, Alberta"}]
-                                    })
-                                    info = result["messages"][-1].content
+                                    info = self._find_gis_contact(value, county_results)
                                 except openai.APIConnectionError:
                                     raise
                                 except Exception as e:
@@ -1015,6 +1069,7 @@ class App:
                                         try:
                                             res = openai_hunter_client.verify_email(email_val)
                                             while str(res[0]) == "202" and attempt_count <= 5: #"The email verification is still in progress. To avoid the request running for too long we return HTTP 202 responses."
+                                                rate_limiter.backoff(attempt_count)
                                                 res = openai_hunter_client.verify_email(email_val)
                                                 attempt_count += 1
                                             if str(res[0]) == "200":
@@ -1056,6 +1111,7 @@ class App:
                                             res = openai_hunter_client.find_email(first_name, last_name, gov_site)
                                             attempt_count = 1
                                             while str(res[0]) == "202" and attempt_count <= 5: #"The email verification is still in progress. To avoid the request running for too long we return HTTP 202 responses."
+                                                rate_limiter.backoff(attempt_count)
                                                 res = openai_hunter_client.find_email(first_name, last_name, gov_site)
                                                 attempt_count += 1
                                             if str(res[0]) == "200":
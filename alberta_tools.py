@@ -1,8 +1,13 @@
 from langchain_core.tools import tool
 import openai_hunter_client
+import rate_limiter
+from cache import DAY, cached, make_key
+from population import _normalize_place, region_code
 from settings import settings
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
 import logging
-from openai import OpenAI, Timeout
 
 logger = logging.getLogger(__name__)
 
@@ -10,23 +15,74 @@ VECTOR_STORE_ID = settings.file_id
 
 #Alberta
 
-client = OpenAI(api_key=settings.openai_api_key, timeout=Timeout(60, connect=10), max_retries=4)
+# Shared with openai_hunter_client: SDK retries are off and every call retries through its _call/_chat
+client = openai_hunter_client.client
+
+
+_TOWN_COLUMNS = ["town", "village", "place", "city", "name", "municipality"]
+_COUNTY_COLUMNS = ["county", "municipal district", "county/md", "md", "district"]
+_REGION_COLUMNS = ["state", "province", "region", "state/province", "province/state"]
+
+
+@lru_cache(maxsize=4)
+def _load_county_table(path, mtime_ns, size):
+    """
+    Index a town-to-county file as {(town, region code): county}. The region column is optional.
+    mtime_ns and size are only part of the cache key, so an edited file is read again.
+    """
+    path = Path(path)
+    df = pd.read_parquet(path) if path.suffix.lower() == ".parquet" else pd.read_csv(path)
+    lower = {str(c).strip().lower(): c for c in df.columns}
+    town_col = next((lower[c] for c in _TOWN_COLUMNS if c in lower), None)
+    county_col = next((lower[c] for c in _COUNTY_COLUMNS if c in lower), None)
+    region_col = next((lower[c] for c in _REGION_COLUMNS if c in lower), None)
+    if town_col is None or county_col is None:
+        logger.warning(f"County table {path.name} needs town and county columns — ignoring it")
+        return {}
+    df = df.dropna(subset=[town_col, county_col])
+    regions = df[region_col] if region_col is not None else pd.Series("", index=df.index)
+    table = {}
+    for town, county, region in zip(df[town_col], df[county_col], regions):
+        region = "" if pd.isna(region) or region == "" else region_code(region)
+        table[(_normalize_place(town), region)] = str(county).strip()
+    logger.info(f"Loaded {len(table)} towns from county table {path.name}")
+    return table
+
+
+def county_table():
+    path = settings.county_table_path
+    if not path or not Path(path).exists():
+        return {}
+    try:
+        stat = Path(path).stat()
+        return _load_county_table(str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        logger.warning(f"Could not read county table {path}: {e}")
+        return {}
 
 
 @tool
 def lookup_county(town: str, state: str) -> str:
     """Find which county or municipal district a town is located in for a given Canadian province. Returns only the county name."""
+    town_key, region = _normalize_place(town), region_code(state)
+    table = county_table()
+    county = table.get((town_key, region)) or table.get((town_key, ""))
+    if county:
+        logger.info(f"County of {town} from local table: {county}")
+        return county
+    # Villages don't move between municipal districts, so answers are kept for a long time
+    return cached("county", make_key(town_key, region), settings.county_cache_ttl_days * DAY,
+                  lambda: _lookup_county(town, state), store_if=bool)
+
+
+def _lookup_county(town: str, state: str) -> str:
     logger.info(f"Calling OpenAI to search for county of {town} in {state}")
     message=[
         {"role": "system", "content": settings.prompt_find_county},
         {"role": "user", "content": f"{town}, {state}"}
     ]
 
-    chat = client.chat.completions.create(
-        model="gpt-4o-mini-search-preview",
-        messages=message,
-        max_tokens = 100,
-    )
+    chat = openai_hunter_client._chat(message, 100)
     
     print(chat)
     if not chat.choices:
@@ -38,7 +94,8 @@ def lookup_county(town: str, state: str) -> str:
 @tool
 def query_rag(county: str) -> str:
     """Search the internal document database for GIS manager contact info for an Alberta county. Returns a JSON string with firstName, lastName, email, phoneNumber, role, govWebsite, and confidence (0.0-1.0). Use this before falling back to web search."""
-    response = client.responses.create(
+    tokens = rate_limiter.estimate_tokens([{"content": settings.prompt_find_in_file}, {"content": county}], settings.max_tokens)
+    response = openai_hunter_client._call(rate_limiter.RESPONSES, tokens, lambda: client.responses.create(
         model="gpt-4o-mini",
         instructions=settings.prompt_find_in_file,
         input=county,
@@ -46,7 +103,7 @@ def query_rag(county: str) -> str:
             "type": "file_search",
             "vector_store_ids": [settings.file_id]
         }]
-    )
+    ))
     for item in response.output:
         if item.type == "file_search_call":
             logger.info(f"[RAG] file_search status: {item.status}")
@@ -78,11 +135,7 @@ def web_search_gis(county: str) -> str:
         "content": county
     })
 
-    chat = client.chat.completions.create(
-        model="gpt-4o-mini-search-preview",
-        messages=message,
-        max_tokens = settings.max_tokens,
-    )
+    chat = openai_hunter_client._chat(message, settings.max_tokens)
     
     print(chat)
     if not chat.choices:
@@ -0,0 +1,58 @@
+"""
+Compare the input reader engines on real files.
+
+    python benchmark_readers.py leads.xlsx national_list.csv --repeat 5
+
+Each file is read the way main.py reads it (every sheet, header=None) with the default
+pandas engine and with the fast engine from sheet_reader (calamine / pyarrow), and the
+script checks that both return the same frames.
+"""
+import argparse
+import time
+from pathlib import Path
+import sheet_reader
+
+
+def _read(path, fast):
+    if Path(path).suffix.lower() == ".csv":
+        return {"Sheet1": sheet_reader.read_csv(path, fast, cached=False, header=None)}
+    return sheet_reader.read_excel(path, fast, cached=False, sheet_name=None, header=None)
+
+
+def _best_time(path, fast, repeat):
+    best, frames = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = _read(path, fast)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, frames
+
+
+def _same(a, b):
+    return a.keys() == b.keys() and all(a[sheet].equals(b[sheet]) for sheet in a)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the default and fast input readers on the given files.")
+    parser.add_argument("paths", nargs="+", help=".xlsx, .xls or .csv files")
+    parser.add_argument("--repeat", type=int, default=3, help="reads per engine; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    print(f"calamine: {'installed' if sheet_reader.HAS_CALAMINE else 'not installed'}   "
+          f"pyarrow: {'installed' if sheet_reader.HAS_PYARROW else 'not installed'}")
+    print(f"{'File':<32}{'Rows':>10}{'Default':>10}{'Fast':>10}{'Speedup':>9}  Same frames")
+    for path in args.paths:
+        fast_engine = sheet_reader.HAS_PYARROW if Path(path).suffix.lower() == ".csv" else sheet_reader.HAS_CALAMINE
+        default_time, default_frames = _best_time(path, False, args.repeat)
+        rows = sum(len(df) for df in default_frames.values())
+        if not fast_engine:
+            print(f"{Path(path).name[:31]:<32}{rows:>10}{default_time:>9.2f}s{'—':>10}{'—':>9}  —")
+            continue
+        fast_time, fast_frames = _best_time(path, True, args.repeat)
+        print(f"{Path(path).name[:31]:<32}{rows:>10}{default_time:>9.2f}s{fast_time:>9.2f}s"
+              f"{default_time / fast_time:>8.1f}x  {'yes' if _same(default_frames, fast_frames) else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
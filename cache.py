@@ -0,0 +1,266 @@
+"""
+Persistent SQLite cache for paid API answers (OpenAI searches, Hunter.io lookups...).
+
+Entries live in named namespaces with their own TTLs. Values are stored as JSON, so
+a cached None ("we asked and there was no answer") is told apart from a miss.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+
+def default_path():
+    base = os.environ.get("LOCALAPPDATA") or Path.home()
+    return Path(base) / "AI Outreach" / "cache.sqlite3"
+
+
+def make_key(*parts):
+    """Stable key for any JSON-serialisable parts (strings are compared exactly — normalise before calling)."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def prompt_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+class Cache:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " created_at REAL NOT NULL, expires_at REAL, last_access REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def get(self, namespace, key, count=True):
+        """Return (hit, value). Expired entries count as misses; count=False leaves the hit/miss counters alone."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            hit = row is not None and (row[1] is None or row[1] >= now)
+            if count:
+                self.stats[namespace]["hits" if hit else "misses"] += 1
+            if not hit:
+                return False, None
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+            )
+        return True, json.loads(row[0])
+
+    def record(self, namespace, hit):
+        """Count a lookup whose get() was made with count=False."""
+        with self._lock:
+            self.stats[namespace]["hits" if hit else "misses"] += 1
+
+    def set(self, namespace, key, value, ttl=None):
+        """Store value for ttl seconds (None = never expires)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now, now + ttl if ttl is not None else None, now),
+            )
+
+    def reset_stats(self):
+        self.stats.clear()
+
+    def summary(self):
+        """{namespace: {"entries", "bytes", "hits", "misses"}} for every namespace stored or looked up."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), SUM(LENGTH(key) + LENGTH(value)) FROM entries GROUP BY namespace"
+            ).fetchall()
+        summary = {ns: {"entries": count, "bytes": size or 0, "hits": 0, "misses": 0} for ns, count, size in rows}
+        for ns, counts in list(self.stats.items()):
+            summary.setdefault(ns, {"entries": 0, "bytes": 0})
+            summary[ns].update(counts)
+        return summary
+
+    def disk_size(self):
+        """Bytes used on disk, including the write-ahead log."""
+        return sum(p.stat().st_size for p in (self.path, Path(f"{self.path}-wal"), Path(f"{self.path}-shm")) if p.exists())
+
+    def export(self, path):
+        """Write a consistent snapshot of the whole cache to a standalone SQLite file."""
+        path = Path(path)
+        path.unlink(missing_ok=True)
+        with self._lock:
+            target = sqlite3.connect(path)
+            try:
+                self._conn.backup(target)
+            finally:
+                target.close()
+        logger.info(f"Exported cache to {path}")
+
+    def import_snapshot(self, path):
+        """Merge a snapshot written by export(). Unexpired entries win when they are newer than ours. Returns the number merged."""
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS snapshot", (str(path),))
+            try:
+                before = self._conn.total_changes
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO main.entries"
+                    " SELECT s.* FROM snapshot.entries s"
+                    " WHERE (s.expires_at IS NULL OR s.expires_at >= ?)"
+                    " AND NOT EXISTS (SELECT 1 FROM main.entries e"
+                    "  WHERE e.namespace = s.namespace AND e.key = s.key AND e.created_at >= s.created_at)",
+                    (time.time(),),
+                )
+                merged = self._conn.total_changes - before
+            finally:
+                self._conn.execute("DETACH DATABASE snapshot")
+        logger.info(f"Imported {merged} cache entries from {path}")
+        return merged
+
+    def prune(self, max_age_days=None, max_bytes=None):
+        """
+        Drop expired entries, entries older than max_age_days, and then the least recently
+        used entries until the stored data fits in max_bytes. Returns the number removed.
+        """
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+            if max_age_days is not None:
+                self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - max_age_days * DAY,))
+            if max_bytes is not None:
+                kept, evict = 0, []
+                rows = self._conn.execute(
+                    "SELECT namespace, key, LENGTH(key) + LENGTH(value) FROM entries ORDER BY last_access DESC"
+                )
+                for namespace, key, size in rows:
+                    kept += size
+                    if kept > max_bytes:
+                        evict.append((namespace, key))
+                self._conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", evict)
+            removed = self._conn.total_changes - before
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        logger.info(f"Pruned {removed} cache entries")
+        return removed
+
+
+cache = Cache(settings.cache_path or default_path()) if settings.cache_enabled else None
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+_async_flights = {}
+
+
+def single_flight(key, fn):
+    """
+    Call fn() once for every caller asking for `key` at the same time: the first caller
+    runs it, later callers wait and share its result (or its exception).
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    try:
+        flight.value = fn()
+        return flight.value
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+async def asingle_flight(key, fn):
+    """single_flight() for coroutines. A caller that is cancelled does not cancel the shared call."""
+    key = (id(asyncio.get_running_loop()), key)
+    task = _async_flights.get(key)
+    if task is None:
+        task = _async_flights[key] = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda _: _async_flights.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def cached(namespace, key, ttl, fetch, store_if=lambda value: value is not None, encode=None):
+    """
+    Return the cached value for key, or call fetch() and cache its result when store_if(result) is true.
+    ttl is seconds, or a function of the fetched value (e.g. shorter for "not found" answers).
+    encode, if given, trims the fetched value down to what is worth storing.
+    Identical lookups already in flight are joined rather than sent twice.
+    """
+    if cache is None:
+        return single_flight((namespace, key), fetch)
+    hit, value = cache.get(namespace, key, count=False)
+    if hit:
+        cache.record(namespace, True)
+        logger.info(f"Cache hit ({namespace})")
+        return value
+
+    def fetch_and_store():
+        # Read again inside the flight: a leader that finished since the first read has stored its answer
+        hit, value = cache.get(namespace, key)
+        if hit:
+            logger.info(f"Cache hit ({namespace})")
+            return value
+        value = fetch()
+        if store_if(value):
+            cache.set(namespace, key, encode(value) if encode else value, ttl(value) if callable(ttl) else ttl)
+        return value
+
+    return single_flight((namespace, key), fetch_and_store)
+
+
+async def acached(namespace, key, ttl, fetch, store_if=lambda value: value is not None, encode=None):
+    """cached() for coroutines: fetch is an async callable."""
+    if cache is None:
+        return await asingle_flight((namespace, key), fetch)
+    hit, value = cache.get(namespace, key, count=False)
+    if hit:
+        cache.record(namespace, True)
+        logger.info(f"Cache hit ({namespace})")
+        return value
+
+    async def fetch_and_store():
+        hit, value = cache.get(namespace, key)
+        if hit:
+            logger.info(f"Cache hit ({namespace})")
+            return value
+        value = await fetch()
+        if store_if(value):
+            cache.set(namespace, key, encode(value) if encode else value, ttl(value) if callable(ttl) else ttl)
+        return value
+
+    return await asingle_flight((namespace, key), fetch_and_store)
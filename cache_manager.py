@@ -0,0 +1,169 @@
+"""
+Inspect and maintain the answer cache (cache.py).
+
+    python cache_manager.py stats
+    python cache_manager.py export warm_cache.sqlite3
+    python cache_manager.py import warm_cache.sqlite3
+    python cache_manager.py prune --older-than 180 --max-mb 200
+
+The same actions are available in the app under More Tools → Cache Manager.
+"""
+import argparse
+import threading
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import cache as cache_module
+from cache import Cache, default_path
+from settings import settings
+
+
+def _open_cache():
+    """The app's cache, or the configured file when caching is switched off for runs."""
+    return cache_module.cache or Cache(settings.cache_path or default_path())
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def hit_rate(counts):
+    lookups = counts.get("hits", 0) + counts.get("misses", 0)
+    return f"{counts['hits'] / lookups:.0%}" if lookups else "—"
+
+
+def _print_stats(cache):
+    """Entries and size per namespace. Hit rates are counted inside a running app, so only Cache Manager shows them."""
+    summary = cache.summary()
+    print(f"Cache: {cache.path} ({format_size(cache.disk_size())} on disk)")
+    print(f"{'Namespace':<16}{'Entries':>10}{'Size':>12}")
+    for ns, counts in sorted(summary.items()):
+        print(f"{ns:<16}{counts['entries']:>10}{format_size(counts['bytes']):>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and maintain the AI Outreach answer cache.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="entries and size per namespace")
+    commands.add_parser("export", help="write a snapshot to copy to another workstation").add_argument("path")
+    commands.add_parser("import", help="merge a snapshot written by export").add_argument("path")
+    prune = commands.add_parser("prune", help="drop expired, old or least recently used entries")
+    prune.add_argument("--older-than", type=float, metavar="DAYS", help="drop entries created more than DAYS ago")
+    prune.add_argument("--max-mb", type=float, metavar="MB", help="evict least recently used entries until the data fits")
+    args = parser.parse_args(argv)
+
+    cache = _open_cache()
+    match args.command:
+        case "stats":
+            _print_stats(cache)
+        case "export":
+            cache.export(args.path)
+            print(f"Exported {cache.path} to {args.path}")
+        case "import":
+            print(f"Merged {cache.import_snapshot(args.path)} entries from {args.path}")
+        case "prune":
+            max_bytes = args.max_mb * 1024 * 1024 if args.max_mb is not None else None
+            print(f"Removed {cache.prune(args.older_than, max_bytes)} entries")
+            _print_stats(cache)
+
+
+def open_cache_manager(root, apply_theme_fn):
+    win = tk.Toplevel(root)
+    win.title("Cache Manager")
+    win.minsize(560, 380)
+    apply_theme_fn(win)
+
+    cache = _open_cache()
+
+    path_label = ttk.Label(win, text=str(cache.path), style="Gray.TLabel")
+    path_label.pack(padx=20, pady=(16, 4), anchor=tk.W)
+
+    # Per-namespace table
+    columns = ("entries", "size", "hits", "misses", "rate")
+    tree = ttk.Treeview(win, columns=columns, height=8)
+    tree.heading("#0", text="Namespace")
+    tree.column("#0", width=140)
+    for col, heading in zip(columns, ("Entries", "Size", "Hits", "Misses", "Hit rate")):
+        tree.heading(col, text=heading)
+        tree.column(col, width=80, anchor=tk.E)
+    tree.pack(padx=20, pady=4, fill=tk.BOTH, expand=True)
+
+    total_label = ttk.Label(win, text="")
+    total_label.pack(padx=20, anchor=tk.W)
+    if cache_module.cache is None:
+        ttk.Label(win, text="Caching is disabled for runs (CACHE_ENABLED=false).",
+                  style="Gray.TLabel").pack(padx=20, anchor=tk.W)
+
+    # Pruning
+    prune_frame = ttk.LabelFrame(win, text="Prune", padding=(10, 8))
+    prune_frame.pack(padx=20, pady=8, fill=tk.X)
+    ttk.Label(prune_frame, text="Older than (days)").grid(row=0, column=0, sticky=tk.W, pady=2)
+    age_entry = ttk.Entry(prune_frame, width=10)
+    age_entry.grid(row=0, column=1, padx=(8, 16), pady=2)
+    ttk.Label(prune_frame, text="Keep at most (MB)").grid(row=0, column=2, sticky=tk.W, pady=2)
+    size_entry = ttk.Entry(prune_frame, width=10)
+    size_entry.grid(row=0, column=3, padx=(8, 0), pady=2)
+    ttk.Label(prune_frame, text="Expired entries are always removed; size limits evict the least recently used first.",
+              style="Gray.TLabel").grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=(4, 0))
+
+    status_label = ttk.Label(win, text="", style="Gray.TLabel")
+    status_label.pack()
+
+    btn_frame = ttk.Frame(win)
+    btn_frame.pack(pady=(4, 12))
+
+    def _refresh():
+        tree.delete(*tree.get_children())
+        for ns, counts in sorted(cache.summary().items()):
+            tree.insert("", tk.END, text=ns, values=(
+                counts["entries"], format_size(counts["bytes"]), counts["hits"], counts["misses"], hit_rate(counts)
+            ))
+        total_label.config(text=f"On disk: {format_size(cache.disk_size())}   ·   hits and misses count lookups since the last run started")
+
+    def _in_background(action, done_text):
+        def _worker():
+            try:
+                result = action()
+                win.after(0, lambda: status_label.config(text=done_text(result)))
+            except Exception as e:
+                win.after(0, lambda e=e: messagebox.showerror("Cache Error", str(e), parent=win))
+            finally:
+                win.after(0, _refresh)
+        status_label.config(text="Working…")
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _export():
+        path = filedialog.asksaveasfilename(title="Export Cache Snapshot", defaultextension=".sqlite3",
+                                            filetypes=[("SQLite", "*.sqlite3"), ("All Files", "*.*")], parent=win)
+        if path:
+            _in_background(lambda: cache.export(path), lambda _: f"Exported to {path}")
+
+    def _import():
+        path = filedialog.askopenfilename(title="Import Cache Snapshot",
+                                          filetypes=[("SQLite", "*.sqlite3"), ("All Files", "*.*")], parent=win)
+        if path:
+            _in_background(lambda: cache.import_snapshot(path), lambda n: f"Merged {n} entries")
+
+    def _prune():
+        try:
+            age = float(age_entry.get()) if age_entry.get().strip() else None
+            max_mb = float(size_entry.get()) if size_entry.get().strip() else None
+        except ValueError:
+            messagebox.showwarning("Invalid Value", "Days and MB must be numbers.", parent=win)
+            return
+        max_bytes = max_mb * 1024 * 1024 if max_mb is not None else None
+        _in_background(lambda: cache.prune(age, max_bytes), lambda n: f"Removed {n} entries")
+
+    ttk.Button(btn_frame, text="Refresh", width=10, command=_refresh).pack(side=tk.LEFT, padx=6)
+    ttk.Button(btn_frame, text="Export…", width=10, command=_export).pack(side=tk.LEFT, padx=6)
+    ttk.Button(btn_frame, text="Import…", width=10, command=_import).pack(side=tk.LEFT, padx=6)
+    ttk.Button(btn_frame, text="Prune", width=10, command=_prune).pack(side=tk.LEFT, padx=6)
+
+    _refresh()
+
+
+if __name__ == "__main__":
+    main()
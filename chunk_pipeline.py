@@ -0,0 +1,143 @@
+"""
+Bounded-memory pipeline for very large CSV inputs.
+
+Instead of loading the whole file, main.py reads it `stream_chunk_rows` rows at a time.
+A reader thread parses chunks ahead into a bounded queue, the run enriches one chunk
+at a time (rows inside it still go through row_executor's bounded window), and a
+writer thread appends finished chunks to each output over a second bounded queue.
+Only a few chunks are ever in memory, however large the file is.
+"""
+import csv
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+import pandas as pd
+import utilities
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def read_chunks(path, chunk_rows):
+    """Parse the CSV chunk by chunk, as strings like a whole-file read with header=None would give."""
+    return pd.read_csv(path, header=None, dtype=str, chunksize=chunk_rows)
+
+
+def count_rows(path):
+    """Record count of the file (for the progress bar). Quoted cells may span lines; blank lines are skipped like read_csv does."""
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        return sum(1 for record in csv.reader(f) if record)
+
+
+def header_section(chunk):
+    """
+    Split the first chunk at its first header row. Returns (header position, data rows under
+    named columns). Header rows repeated further down are left in as rows; the row planner skips them.
+    """
+    headers = utilities._find_duplicate_headers(chunk)
+    header_row = headers[0] if headers else 0
+    section = chunk.iloc[header_row + 1:].copy()
+    section.columns = [str(col) if pd.notna(col) else "" for col in chunk.iloc[header_row]]
+    return header_row, section.reset_index(drop=True)
+
+
+def prefetch(chunks, queue_chunks):
+    """
+    Iterate `chunks` on a background thread, keeping at most `queue_chunks` parsed chunks waiting.
+    Closing the generator early stops the reader.
+    """
+    waiting = queue.Queue(maxsize=max(queue_chunks, 1))
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                waiting.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read():
+        try:
+            for chunk in chunks:
+                if not _put(chunk):
+                    return
+            _put(_DONE)
+        except Exception as e:
+            _put(e)
+
+    threading.Thread(target=_read, daemon=True, name="chunk-reader").start()
+    try:
+        while True:
+            item = waiting.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+class ChunkWriter:
+    """
+    Appends finished chunks to one CSV per output key on a background thread. Chunks arrive
+    over a bounded queue, so a slow disk holds the run back instead of piling chunks up in
+    memory. Each output grows in a temp file in `directory`; close() renames it into place.
+    """
+
+    def __init__(self, directory, queue_chunks):
+        self.directory = Path(directory)
+        self._queue = queue.Queue(maxsize=max(queue_chunks, 1))
+        self._outputs = {}  # key -> {"tmp", "file", "columns", "complete", "rows"}
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, daemon=True, name="chunk-writer")
+        self._thread.start()
+
+    def write(self, key, df, complete=True):
+        """Queue df to be appended to output `key`. complete=False marks the whole output incomplete."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put((key, df, complete))
+
+    def _drain(self):
+        while (item := self._queue.get()) is not None:
+            key, df, complete = item
+            try:
+                out = self._outputs.get(key)
+                if out is None:
+                    tmp = self.directory / f"~stream_{os.getpid()}_{len(self._outputs)}.tmp.csv"
+                    out = self._outputs[key] = {"tmp": tmp, "file": open(tmp, "w", newline="", encoding="utf-8"),
+                                                "columns": list(df.columns), "complete": True, "rows": 0}
+                    df.iloc[:0].to_csv(out["file"], index=False)
+                # Every chunk is written under the first chunk's header
+                df.reindex(columns=out["columns"]).to_csv(out["file"], header=False, index=False)
+                out["file"].flush()
+                out["rows"] += len(df)
+                out["complete"] = out["complete"] and complete
+            except Exception as e:
+                logger.error(f"Could not append {len(df)} rows to output '{key}': {e}")
+                if key in self._outputs:
+                    self._outputs[key]["complete"] = False
+                self._error = e
+
+    def close(self, path_for, complete=True):
+        """
+        Wait for queued chunks, then rename every output to path_for(key, complete). An output
+        is complete only if all of its chunks were and the run finished. Returns the final paths.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        written = []
+        for key, out in self._outputs.items():
+            out["file"].close()
+            path = Path(path_for(key, complete and out["complete"]))
+            os.replace(out["tmp"], path)
+            logger.info(f"Wrote {out['rows']} rows to '{path.name}'")
+            written.append(path)
+        self._outputs.clear()
+        return written
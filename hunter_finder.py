@@ -1,14 +1,107 @@
 import threading
 import logging
 import re
+import unicodedata
+from collections import Counter
 import pandas as pd
 import openai_hunter_client
+import rate_limiter
+import output_writer
+import sheet_reader
+from settings import settings
 from datetime import datetime
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 
 
+def _name_token(name):
+    """'José' -> 'jose', "O'Brien-Smith" -> 'obriensmith': the form Hunter uses in email patterns."""
+    name = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z]", "", name.lower())
+
+
+def fetch_domain_directory(domain, logger):
+    """
+    What Hunter knows about a domain from Domain Search, fetched page by page:
+    {"pattern": "{first}.{last}" or None, "emails": [...]}. Returns None if the search fails.
+    The whole directory is fetched (up to hunter_domain_search_max_emails), so most people
+    in a group match a known email and need no Email Finder or Verifier call of their own.
+    """
+    max_emails = max(settings.hunter_domain_search_max_emails, 1)
+    page_size = max(min(settings.hunter_domain_search_page_size, max_emails), 1)
+    directory = {"pattern": None, "emails": []}
+    offset = 0
+    while offset < max_emails:
+        status, body = openai_hunter_client.domain_search(domain, min(page_size, max_emails - offset), offset)
+        if str(status) != "200":
+            logger.info(f"Domain search for {domain} returned {status}")
+            return None if offset == 0 else directory
+        data = body.get("data") or {}
+        directory["pattern"] = directory["pattern"] or data.get("pattern")
+        emails = data.get("emails") or []
+        directory["emails"].extend(emails)
+        total = (body.get("meta") or {}).get("results") or 0
+        offset += len(emails) or page_size
+        if not emails or offset >= total:
+            break
+    logger.info(f"Domain search for {domain}: {len(directory['emails'])} known emails, pattern {directory['pattern'] or 'unknown'}")
+    return directory
+
+
+def match_domain_email(first, last, domain, directory):
+    """
+    Match a person against a domain directory: a known email for the same first and last
+    name first, then the domain's naming pattern. Returns a dict shaped like Email Finder's
+    data, or None when the person has to be looked up individually. Pattern guesses come
+    back with "guessed": True and must go through verify_guess before they are used.
+    """
+    first_token, last_token = _name_token(first), _name_token(last)
+    if not first_token or not last_token:
+        return None
+    for entry in directory["emails"]:
+        if _name_token(entry.get("first_name")) == first_token and _name_token(entry.get("last_name")) == last_token:
+            return {
+                "email": entry.get("value"),
+                "score": entry.get("confidence", ""),
+                "sources": entry.get("sources") or [],
+                "domain": domain,
+                "linkedin_url": entry.get("linkedin"),
+            }
+    pattern = directory.get("pattern")
+    if pattern:
+        local = (pattern.replace("{first}", first_token).replace("{last}", last_token)
+                 .replace("{f}", first_token[0]).replace("{l}", last_token[0]))
+        if "{" not in local:
+            return {
+                "email": f"{local}@{domain}",
+                "score": "",
+                "sources": [],
+                "domain": domain,
+                "linkedin_url": None,
+                "guessed": True,
+            }
+    return None
+
+
+def verify_guess(matched, logger):
+    """
+    Run a pattern-guessed address through Hunter's Email Verifier and take its score and
+    sources. Returns None (look the person up with Email Finder instead) if it is not deliverable.
+    """
+    res = openai_hunter_client.verify_email(matched["email"])
+    attempt = 1
+    while str(res[0]) == "202" and attempt <= 5:
+        rate_limiter.backoff(attempt)
+        res = openai_hunter_client.verify_email(matched["email"])
+        attempt += 1
+    data = (res[1].get("data") or {}) if str(res[0]) == "200" else {}
+    if data.get("status") not in ("valid", "accept_all"):
+        logger.info(f"  pattern guess {matched['email']} not verified ({data.get('status') or res[0]})")
+        return None
+    return {**matched, "score": data.get("score", ""), "sources": data.get("sources") or [], "guessed": False}
+
+
 def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
     win = tk.Toplevel(root)
     win.title("Hunter Email Finder")
@@ -47,6 +140,10 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
     ttk.Label(col_frame, text="* required  |  Name is split on first space → First Last",
               style="Gray.TLabel").grid(row=len(col_fields), column=0, columnspan=2, sticky=tk.W, pady=(4, 0))
 
+    group_by_domain = tk.BooleanVar(value=True)
+    ttk.Checkbutton(col_frame, text="Group people by domain (one Hunter Domain Search per organization)",
+                    variable=group_by_domain).grid(row=len(col_fields) + 1, column=0, columnspan=2, sticky=tk.W, pady=(4, 0))
+
     # Output folder
     out_frame = ttk.LabelFrame(win, text="Output", padding=(10, 8))
     out_frame.pack(padx=20, pady=(4, 8), fill=tk.X)
@@ -136,8 +233,7 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
             out_entry.insert(0, default)
             out_entry.config(state="readonly")
         try:
-            ext = Path(path).suffix.lower()
-            df = pd.read_csv(path) if ext == ".csv" else pd.read_excel(path)
+            df = sheet_reader.read_table(path)
         except Exception as e:
             messagebox.showerror("Error", f"Could not read file:\n{e}", parent=win)
             return
@@ -165,6 +261,7 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
                 messagebox.showwarning("Missing Column", f'"{req}" column is required.', parent=win)
                 return
         state["column_for"] = col
+        state["group_by_domain"] = group_by_domain.get()
         state["run_active"] = True
         state["run_id"] += 1
         run_id = state["run_id"]
@@ -188,7 +285,7 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
             path = state["file_path"]
             ext = Path(path).suffix.lower()
             try:
-                df = pd.read_csv(path) if ext == ".csv" else pd.read_excel(path)
+                df = sheet_reader.read_table(path)
             except Exception as e:
                 win_logger.error(f"Could not read file: {e}")
                 win.after(0, lambda: progress_label.config(text="Error reading file."))
@@ -205,13 +302,34 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
             output_dir = Path(state["output_path"]) if state["output_path"] else Path(path).parent
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+            # Organizations with several people get one Domain Search; everyone else goes to Email Finder
+            group_sizes = Counter()
+            if state["group_by_domain"]:
+                for org in df[col["Organization Website"]]:
+                    org = str(org if pd.notna(org) else "").strip()
+                    group_sizes[_extract_domain(org) or org.lower()] += 1
+            directories = {}
+
+            def _domain_directory(org_raw, domain):
+                group = _extract_domain(org_raw) or org_raw.lower()
+                if group_sizes[group] < max(settings.hunter_domain_group_min_rows, 2):
+                    return None
+                if domain not in directories:
+                    try:
+                        directories[domain] = fetch_domain_directory(domain, win_logger)
+                    except Exception as e:
+                        win_logger.warning(f"Domain search for {domain} failed: {e}")
+                        directories[domain] = None
+                return directories[domain]
+
+            # Finished rows are streamed to disk as they complete, so a crash keeps them
+            stream = output_writer.RowStream(df, output_dir / f"hunter_{Path(path).stem}_{timestamp}_incomplete{ext}",
+                                             settings.autosave_seconds)
+
             def _save(cancelled=False):
                 out_name = f"hunter_{Path(path).stem}_{timestamp}{ext}"
-                out_path = output_dir / out_name
-                if ext == ".csv":
-                    df.to_csv(out_path, index=False)
-                else:
-                    df.to_excel(out_path, index=False, engine="openpyxl")
+                output_writer.atomic_save(df, output_dir / out_name)
+                stream.close()
                 label = f"{'Cancelled' if cancelled else 'Done'} — written to {out_name}"
                 win_logger.info(label)
                 return out_name
@@ -249,9 +367,18 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
                 win_logger.info(f"Row {idx}: {first} {last} @ {domain}")
 
                 try:
-                    res = openai_hunter_client.find_email(first, last, domain)
+                    directory = _domain_directory(org_raw, domain)
+                    matched = match_domain_email(first, last, domain, directory) if directory else None
+                    if matched and matched.get("guessed"):
+                        matched = verify_guess(matched, win_logger)
+                    if matched:
+                        win_logger.info(f"  matched from {domain} domain search")
+                        res = (200, {"data": matched})
+                    else:
+                        res = openai_hunter_client.find_email(first, last, domain)
                     attempt = 1
                     while str(res[0]) == "202" and attempt <= 5:
+                        rate_limiter.backoff(attempt)
                         res = openai_hunter_client.find_email(first, last, domain)
                         attempt += 1
 
@@ -272,6 +399,7 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
 
                         if col.get("LinkedIn") and col["LinkedIn"] in df.columns and linkedin_url:
                             df.at[idx, col["LinkedIn"]] = linkedin_url
+                        stream.row_done(idx)
 
                         win_logger.info(f"  → {email or '(no email)'} (score: {score})")
                     else:
@@ -288,6 +416,9 @@ def open_hunter_finder(root, formatter, apply_theme_fn, TextHandler):
             ))
         except Exception as e:
             win_logger.error(f"Unexpected error: {e}")
+            if "stream" in locals():
+                stream.close(keep_partial=True)
+                win_logger.info(f"Progress kept in {stream.partial_path.name}")
             win.after(0, lambda: progress_label.config(text="Error — see log."))
         finally:
             state["run_active"] = False
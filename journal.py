@@ -0,0 +1,81 @@
+"""
+Crash-safe checkpoint journal for runs of main.py.
+
+Every finished row is appended (committed immediately, WAL) under the input file's
+content hash, sheet, section, role and row index, together with the API answers it
+was built from. If a run dies — crash, lost connection, cancel — selecting the same
+file again can resume: journaled rows are written back without any API calls.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from cache import default_path
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def file_hash(path):
+    """sha256 of the file's contents, so a renamed copy still resumes and an edited file does not."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " file_hash TEXT NOT NULL, sheet TEXT NOT NULL, section TEXT NOT NULL, role INTEGER NOT NULL,"
+            " row INTEGER NOT NULL, updates TEXT NOT NULL, raw TEXT NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (file_hash, sheet, section, role, row))"
+        )
+
+    def record(self, file_hash, sheet, section, role, rows, updates, raw=None):
+        """Journal the same updates for every row index in `rows` (rows that share one entity)."""
+        now = time.time()
+        updates, raw = json.dumps(updates or {}, default=str), json.dumps(raw or {}, default=str)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (file_hash, sheet, section, role, row, updates, raw, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(file_hash, str(sheet), str(section), int(role), int(row), updates, raw, now) for row in rows],
+            )
+
+    def load(self, file_hash, sheet, section, role, rows=None):
+        """{row index: updates} journaled for one sheet section and role, optionally only rows in the (first, last) range."""
+        first, last = rows or (0, 2 ** 62)
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT row, updates FROM rows WHERE file_hash = ? AND sheet = ? AND section = ? AND role = ?"
+                " AND row BETWEEN ? AND ?",
+                (file_hash, str(sheet), str(section), int(role), int(first), int(last)),
+            ).fetchall()
+        return {row: json.loads(updates) for row, updates in found}
+
+    def count(self, file_hash):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rows WHERE file_hash = ?", (file_hash,)).fetchone()[0]
+
+    def clear(self, file_hash):
+        with self._lock:
+            self._conn.execute("DELETE FROM rows WHERE file_hash = ?", (file_hash,))
+
+    def prune(self, max_age_days):
+        """Forget runs that were never resumed."""
+        with self._lock:
+            self._conn.execute("DELETE FROM rows WHERE created_at < ?", (time.time() - max_age_days * 24 * 60 * 60,))
+
+
+journal = Journal(settings.journal_path or default_path().with_name("journal.sqlite3"))
@@ -1,5 +1,7 @@
 import pandas as pd
 import openai_hunter_client
+import rate_limiter
+import population
 import utilities
 import json
 from presets import *
@@ -7,8 +9,19 @@ from datetime import datetime
 import hunter_finder
 import name_splitter
 import merge
+import cache_manager
+from cache import cache
 import winsound
 import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import row_executor
+import row_planner
+import journal
+import output_writer
+import chunk_pipeline
+import sheet_reader
+from stage_graph import StageGraph
 from settings import settings
 import os
 import re
@@ -75,6 +88,7 @@ class App:
         style.configure("Processing.TLabel", foreground="gray", font=("TkDefaultFont", 9, "bold"))
 
         self.file_path = None
+        self.incremental = False  # only refresh blank, low-confidence or stale rows
         self.prompt_gis = settings.initial_prompt
         self.prompt_mayor = settings.initial_prompt_mayor
         self.prompt_assessor = settings.initial_prompt_assessor
@@ -168,6 +182,7 @@ class App:
                 ("Hunter Finder", self.open_hunter_finder),
                 ("Name Splitter", self.open_name_splitter),
                 ("Merge Files",   self.open_merge_tool),
+                ("Cache Manager", self.open_cache_manager),
             ]
 
             frame = ttk.Frame(popup, padding=4)
@@ -535,6 +550,13 @@ class App:
             sheet_action_cb.pack(pady=(14, 3), anchor=tk.W)
             sheet_action_cb.config(state="disabled")
 
+            incremental_var = tk.IntVar(value=int(self.incremental))
+            ttk.Checkbutton(
+                left_frame,
+                text="Only refresh blank, low-confidence or stale rows",
+                variable=incremental_var
+            ).pack(pady=(3, 3), anchor=tk.W)
+
             # Right side: column mapping grid
             right_frame = ttk.Frame(container)
             right_frame.pack(side=tk.LEFT, padx=10, anchor=tk.N)
@@ -577,6 +599,8 @@ class App:
                     if check_vars.get(val) and check_vars[val].get() == 1
                 }
 
+                self.incremental = incremental_var.get() == 1
+
                 # Update column mappings from combobox selections
                 self.column_for = {key: entry.get() or None for key, entry in entries.items()}
 
@@ -613,6 +637,9 @@ class App:
     def open_merge_tool(self):
         merge.open_merge_tool(self.root, self._apply_theme_to_titlebar)
 
+    def open_cache_manager(self):
+        cache_manager.open_cache_manager(self.root, self._apply_theme_to_titlebar)
+
     def select_file(self):
         # Warn if a run is in progress
         if self._run_active:
@@ -666,6 +693,39 @@ class App:
             thread.start()
 
 
+    def _offer_resume(self, run_id, file_path):
+        """
+        If an earlier run of this exact file stopped part-way, ask whether to skip the rows it finished.
+        Runs on the run's worker thread, since hashing a large input takes a while; the question is asked
+        on the Tk thread. Returns (file hash or None, resume).
+        """
+        try:
+            file_hash = journal.file_hash(file_path)
+            journal.journal.prune(settings.journal_retention_days)
+            done = journal.journal.count(file_hash)
+        except Exception as e:
+            self.logger.warning(f"Checkpoint journal unavailable: {e}")
+            return None, False
+        if not done or run_id != self.current_run_id:
+            return file_hash, False
+        answered = threading.Event()
+        choice = [False]
+
+        def ask():
+            choice[0] = messagebox.askyesno(
+                "Resume Run",
+                f"An earlier run of this file stopped after {done} finished rows.\n\n"
+                "Resume it? Finished rows are reused without new searches. Choose No to start over."
+            )
+            answered.set()
+
+        self.root.after(0, ask)
+        answered.wait()
+        if choice[0]:
+            return file_hash, True
+        journal.journal.clear(file_hash)
+        return file_hash, False
+
     def select_output_folder(self, output):
         folder = filedialog.askdirectory(title="Select Output Folder")
         if folder:
@@ -681,14 +741,325 @@ class App:
         self.root.mainloop()
     
 
+    def _fill_populations(self, df):
+        """Resolve every blank Population cell in the section through population.resolve and write the answers into df."""
+        population_col = self.column_for["Population"]
+        cells = df[population_col]
+        filled = cells.notna() & cells.ne("") & cells.ne(0)
+        plan = row_planner.plan_rows(df, self.column_for["County/City"], self.column_for.get("State"),
+                                     row_planner.mostly_empty(df) | filled)
+        if not plan.work:
+            return
+
+        places = {(str(value).strip(), state.strip()): key for key, _, value, state in plan.work}
+        try:
+            found = population.resolve(list(places))
+        except openai.APIConnectionError:
+            raise
+        except Exception as e:
+            # Populations are a side column; a failure here must not abort the roles
+            self.logger.error(f"Population lookup failed, continuing without populations: {e}")
+            return
+        for place, population_value in found.items():
+            for idx in plan.entities[places[place]]:
+                df.loc[idx, population_col] = population_value
+        self.logger.info(f"Saved population for {len(found)} of {len(places)} places")
+
+    def _fresh_rows(self, df):
+        """
+        Rows an incremental run leaves alone: they have an email with Email Confidence of at
+        least incremental_min_confidence, a source, and a Last Updated within incremental_max_age_days.
+        """
+        def column(name):
+            col = self.column_for.get(name)
+            return df[col] if col in df.columns else pd.Series("", index=df.index)
+
+        def filled(series):
+            return series.fillna("").astype(str).str.strip().ne("")
+
+        confident = pd.to_numeric(column("Email Confidence"), errors="coerce") >= settings.incremental_min_confidence
+        sourced = filled(column("Source")) | filled(column("Hunter Email Source"))
+        updated = pd.to_datetime(column("Last Updated"), errors="coerce", format="ISO8601")
+        recent = updated >= pd.Timestamp.now() - pd.Timedelta(days=settings.incremental_max_age_days)
+        return filled(column("Email")) & confident & sourced & recent
+
+    def _logical_updates(self, updates):
+        """Key row updates by logical column ("Email") instead of this section's header, so another section can reuse them."""
+        logical_for = {col: logical for logical, col in self.column_for.items() if col}
+        return {logical_for.get(col, col): val for col, val in updates.items()}
+
+    def _section_updates(self, updates):
+        """Map updates from _logical_updates back onto the current section's headers."""
+        return {self.column_for.get(col) or col: val for col, val in updates.items()
+                if col not in self.column_for or self.column_for[col]}
+
+    def _current_tags(self, updates, userChoice):
+        """Reused or journaled updates carry the tags picked when they were searched; put this section's tags in instead."""
+        if not updates:
+            return updates
+        updates = dict(updates)
+        for logical, tag in zip(("Tag", "Contact Tag"), self.role_tags.get(userChoice, (None, None))):
+            if self.column_for.get(logical) in updates:
+                updates[self.column_for[logical]] = tag
+        return updates
+
+    def _process_row(self, run_id, stage_pool, role, userChoice, system_prompt, idx, value, state, row):
+        """
+        Search, verify and enrich one row. Runs on a worker thread, so it only reads and
+        writes the `row` dict it was handed — never the section DataFrame.
+        The row's lookups run as a StageGraph on `stage_pool`: after the person search,
+        the Hunter.io email stage and the outreach message overlap.
+        Returns (updates, incomplete, raw) where updates maps column -> new value and raw
+        holds the API answers behind them, or None if the run was cancelled. A row whose
+        search failed (API error or an unreadable answer) is incomplete and must be rerun.
+        """
+        if run_id != self.current_run_id:
+            return None
+
+        original = dict(row)
+        incomplete = False
+        search_failed = False
+        raw = {}  # API answers the row was built from, kept in the checkpoint journal
+
+        def changes():
+            return {col: val for col, val in row.items() if col not in original or original[col] is not val}
+
+        self.logger.info("Currently on: " + str(value))
+
+        def search_stage(_):
+            nonlocal search_failed
+            try:
+                info = openai_hunter_client.search(#                                             ------------------OpenAI search for person---------------------
+                    f"{value} {state} Government".strip(),
+                    role,
+                    system_prompt
+                )
+            except openai.APIConnectionError:
+                raise
+
+            except Exception as e:
+                self.logger.error(f"OpenAI search failed for row {idx} ({value}): {str(e)}")
+                search_failed = True
+                return None
+
+            info = (info or "").strip()
+            raw["search"] = info
+            if not info or info == "None" or info is None:
+                return None
+
+            try:
+                parsedInfo = json.loads(info)
+            except json.JSONDecodeError:
+                parsedInfo = None
+            if not isinstance(parsedInfo, dict):
+                self.logger.warning(f"OpenAI returned non-JSON for row {idx} ({value}), it will need a rerun.")
+                search_failed = True
+                return None
+
+            #Add the new name, email, role, phone number, and info source
+            row[self.column_for["First Name"]] = parsedInfo.get("firstName", "")
+            row[self.column_for["Last Name"]] = parsedInfo.get("lastName", "")
+            row[self.column_for["Email"]] = parsedInfo.get("email", "")
+            row[self.column_for["Phone Number"]] = re.sub(r"[\s().,+]", "", parsedInfo.get("phoneNumber", ""))
+            row[self.column_for["Role/Title"]] = parsedInfo.get("role", "")
+            row["Email Domain"] = parsedInfo.get("emailDomain", "")
+            _tag, _contact_tag = self.role_tags.get(userChoice, (None, None))
+            row[self.column_for["Tag"]] = _tag
+            row[self.column_for["Contact Tag"]] = _contact_tag
+            if self.column_for.get("Source"):
+                row[self.column_for["Source"]] = parsedInfo.get("sourceWebsite", "")
+
+            if role == Role.GIS and self.column_for.get("Address Data Owner / Department"):
+                row[self.column_for["Address Data Owner / Department"]] = parsedInfo.get("addressDepartment", "")
+
+            state_mapping = {item: label for lst, label in stateCorrectionMap.items() for item in lst}
+
+            #Correct state format
+            if self.column_for.get("State"):
+                _raw_state = row.get(self.column_for["State"])
+                thisState = str(_raw_state).strip().lower() if not pd.isna(_raw_state) else ""
+                if thisState and thisState in state_mapping:
+                    row[self.column_for["State"]] = state_mapping.get(thisState.lower())
+                    if self.column_for.get("Contact State"):
+                        row[self.column_for["Contact State"]] = state_mapping.get(thisState.lower())
+                elif thisState and thisState[0:2] in state_mapping:
+                    row[self.column_for["State"]] = state_mapping.get(thisState[0:2].lower())
+                    if self.column_for.get("Contact State"):
+                        row[self.column_for["Contact State"]] = state_mapping.get(thisState[0:2].lower())
+            return parsedInfo
+
+        def email_stage(done):
+            parsedInfo = done["search"]
+            if not parsedInfo:
+                return
+
+            reFind = False
+            email_val = parsedInfo.get("email")
+            email_type = parsedInfo.get("emailType")
+            incompleteEmailArtifacts = ["*", "protected", "info@", "contact@", "gis@", "assessor", "pa@", "ecta@", "administration", "admin@", "office@"]
+            if email_val and isinstance(email_val, str):
+                reFind = any([c in email_val.lower() for c in incompleteEmailArtifacts]) or email_val.lower() == "none" or email_type != "person"
+            verifyNeeded = bool(email_val) and email_type == "person" and email_val != "None" and not reFind
+            #Verify personal emails found
+            if verifyNeeded:
+                try:
+                    res = openai_hunter_client.verify_email(email_val)
+                    attempt_count = 1
+                    while str(res[0]) == "202" and attempt_count <= 5: #"The email verification is still in progress. To avoid the request running for too long we return HTTP 202 responses."
+                        rate_limiter.backoff(attempt_count)
+                        res = openai_hunter_client.verify_email(email_val)
+                        attempt_count += 1
+                    raw["verify_email"] = res
+                    if str(res[0]) == "200":
+                        verification_data = res[1].get("data")
+                        if verification_data:
+                            score = verification_data.get("score", -1)
+                            status = verification_data.get("status")
+                            sources = verification_data.get("sources", [])
+                            source = sources[0]["uri"] if sources else ""
+                            self.logger.info("Data found by hunter.io:")
+                            self.logger.info("Status: " + status)
+                            if score >= 0:
+                                self.logger.info("Score: " + str(score))
+                                row["Email Confidence"] = str(score)
+                                row["Hunter Email Source"] = source
+                                self.logger.info("Source: " +  source)
+                                if score < 80:
+                                    reFind = True
+                                    self.logger.info("Confidence score is too low, attempting to search again")
+                        else:
+                            self.logger.error("Hunter.io did not return data")
+
+                    elif str(res[0]) == "400":
+                        errors = res[1].get("errors") or []
+                        if errors and errors[0].get("id") == "invalid_email":
+                            reFind = True
+                    else:
+                        self.logger.warning("Hunter.io Verify API Call Failed")
+                except Exception as e:
+                    self.logger.warning(f"Hunter.io verify_email API error (skipping): {str(e)}")
+                    # Continue processing without verification
+
+            #Search for personal email if department email or no email was returned
+            first_name = parsedInfo.get("firstName")
+            last_name = parsedInfo.get("lastName")
+            gov_site = parsedInfo.get("govWebsite")
+            if (not verifyNeeded or reFind) and first_name and last_name and first_name.lower() not in ["none", "gis", "tax", "appraiser"] and last_name.lower() not in ["none", "gis", "tax", "team", "appraiser"] and gov_site:
+                try:
+                    res = openai_hunter_client.find_email(first_name, last_name, gov_site)
+                    attempt_count = 1
+                    while str(res[0]) == "202" and attempt_count <= 5: #"The email verification is still in progress. To avoid the request running for too long we return HTTP 202 responses."
+                        rate_limiter.backoff(attempt_count)
+                        res = openai_hunter_client.find_email(first_name, last_name, gov_site)
+                        attempt_count += 1
+                    raw["find_email"] = res
+                    if str(res[0]) == "200":
+                        parsedHunterResponse = res[1].get("data")
+                        if parsedHunterResponse:
+                            email = parsedHunterResponse.get("email")
+                            if email is not None:
+                                score = parsedHunterResponse["score"]
+                                sources = parsedHunterResponse.get("sources", [])
+                                number = parsedHunterResponse.get("phone_number")
+                                linkedin = parsedHunterResponse.get("linkedin_url")
+                                source = sources[0]["uri"] if sources else ""
+                                self.logger.info("Data found by hunter.io:")
+                                self.logger.info("email: " + email)
+                                self.logger.info("score: " + str(score))
+                                self.logger.info("source: " + source)
+                                if (reFind and score >= 90) or (not pd.isna(row["Email Confidence"]) and str(row["Email Confidence"]).strip() != "" and score > int(row["Email Confidence"])) or pd.isna(row[self.column_for["Email"]]) or row[self.column_for["Email"]] == "" or row[self.column_for["Email"]] == 0:
+                                    self.logger.info(f"Saving hunter.io email {email} to email column, moving original email to Alternative Email column")
+                                    row["Alternative Email"] = row[self.column_for["Email"]]
+                                    row["Alternative Email Confidence"] = row["Email Confidence"]
+                                    row[self.column_for["Email"]] = email
+                                    row["Email Confidence"] = str(score)
+                                    row["Hunter Email Source"] = source
+                                    row[self.column_for["LinkedIn"]] = linkedin
+                                    if (pd.isna(row[self.column_for["Phone Number"]]) or row[self.column_for["Phone Number"]] == 0) and number != 0 and number is not None:
+                                        row[self.column_for["Phone Number"]] = number
+                                elif score>=70:
+                                    self.logger.info(f"Saving hunter.io email {email} to Alternative Email column")
+                                    row["Alternative Email"] = email
+                                    row["Alternative Email Confidence"] = str(score)
+                                    row["Hunter Email Source"] = source
+                                    row[self.column_for["LinkedIn"]] = linkedin
+                                    if (pd.isna(row[self.column_for["Phone Number"]]) or row[self.column_for["Phone Number"]] == 0) and number != 0 and number is not None:
+                                        row[self.column_for["Phone Number"]] = number
+                                else:
+                                    self.logger.info(f"Hunter.io email score less than 70, too low to save ({score}): {email}")
+                            else:
+                                self.logger.info("Hunter.io did not find an email for " + first_name + " " + last_name)
+                        else:
+                            self.logger.error("Hunter.io did not return data")
+                    else:
+                        self.logger.info("Hunter.io Find API Call Failed")
+                except Exception as e:
+                    self.logger.warning(f"Hunter.io find_email API error (skipping): {str(e)}")
+                    # Continue processing without finding alternative email
+
+
+        def outreach_stage(done):
+            parsedInfo = done["search"]
+            if not parsedInfo:
+                return
+            first_name = parsedInfo.get("firstName")
+            last_name = parsedInfo.get("lastName")
+            #Generate LinkedIn Outreach Message
+            if first_name and last_name and parsedInfo.get("role"):
+                linkedinOutreachMessage = openai_hunter_client.search_misc(
+                    f"{value} {state}".strip(),
+                    SearchFor.OUTREACH_MESSAGE,
+                    f"{first_name} {last_name}",
+                    role,
+                    f"{value} {state}"
+                )
+                raw["outreach"] = linkedinOutreachMessage
+                if linkedinOutreachMessage:
+                    row[self.column_for["Contact LinkedIn Outreach Message"]] = linkedinOutreachMessage
+                    self.logger.info(f"Generated and saved {value} {state} linkedinOutreachMessage:" + str(linkedinOutreachMessage))
+
+        graph = (StageGraph()
+                 .add("search", search_stage)
+                 .add("email", email_stage, after=["search"])
+                 .add("outreach", outreach_stage, after=["search"]))
+        try:
+            graph.run(stage_pool)
+        except TypeError as e:
+            #This should not happen
+            self.logger.error("TypeError:" + str(e))
+            self.logger.warning("You may be missing a row of data in the output.")
+            incomplete = True
+        incomplete = incomplete or search_failed
+
+        if not incomplete and self.column_for.get("Last Updated"):
+            row[self.column_for["Last Updated"]] = datetime.now().strftime("%Y-%m-%d")
+
+        return changes(), incomplete, raw
+
     def main(self, run_id):
         try:
+            file_hash, resume = self._offer_resume(run_id, self.file_path)
+            if run_id != self.current_run_id:
+                return
             ext = Path(self.file_path).suffix.lower()
+            streaming = (ext == ".csv" and settings.stream_csv_min_mb > 0
+                         and Path(self.file_path).stat().st_size >= settings.stream_csv_min_mb * 1024 * 1024)
+            workbook = None
             try:
-                if ext == ".csv":
-                    sheets = {"Sheet1": pd.read_csv(self.file_path, header=None)}
+                if streaming:
+                    # Very large CSVs are read chunk by chunk; only the first chunk is loaded up front
+                    chunks = chunk_pipeline.prefetch(chunk_pipeline.read_chunks(self.file_path, settings.stream_chunk_rows),
+                                                     settings.stream_queue_chunks)
+                    header_row, first_chunk = chunk_pipeline.header_section(next(chunks))
+                    sheets = {"Sheet1": first_chunk}
+                elif ext == ".csv":
+                    sheets = {"Sheet1": sheet_reader.read_csv(self.file_path, header=None)}
+                elif ext in sheet_reader.LAZY_EXTENSIONS:
+                    # Only each sheet's first rows are read up front; a sheet is parsed in full once it is reached
+                    workbook = sheet_reader.Workbook(self.file_path)
+                    sheets = {name: workbook.head(name, settings.xlsx_header_rows) for name in workbook.sheet_names}
                 else:
-                    sheets = pd.read_excel(self.file_path, sheet_name=None, header=None)
+                    sheets = sheet_reader.read_excel(self.file_path, sheet_name=None, header=None)
             except ValueError as e:
                 err = str(e)
                 self.logger.error(f"Could not read file: {err}")
@@ -722,29 +1093,66 @@ class App:
             state_val = "unknown"
             tag_str = ""
             stats = {"rows": 0, "files": 0, "written_files": []}
-
-            def _write_file(complete = True):
-                #WRITE per role — timestamp at finish time to avoid collisions
+            # (role, entity key) -> row updates by logical column, shared across sections and sheets; bounded when streaming
+            resolved_entities = row_planner.EntityMemo(settings.stream_entity_memo_size if streaming else None)
+            if cache is not None:
+                cache.reset_stats()  # Cache Manager hit rates cover the current run
+            stats_lock = threading.Lock()
+            row_pool = ThreadPoolExecutor(max_workers=max(settings.max_concurrent_rows, 1), thread_name_prefix="row")
+            stage_pool = ThreadPoolExecutor(max_workers=max(settings.max_concurrent_rows, 1) * 3, thread_name_prefix="stage")
+
+            def _output_path(tag_str, complete):
                 write_dir = Path(self.output_path) if self.output_path else input_path.parent
-                if complete:
-                    out_filename = write_dir / f"{sanitize(state_val)}_{sanitize(tag_str)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
-                else:
-                    out_filename = write_dir / f"{sanitize(state_val)}_{sanitize(tag_str)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_incomplete{ext}"
-                if ext == ".csv":
-                    df.to_csv(out_filename, index=False)
+                suffix = "" if complete else "_incomplete"
+                return write_dir / f"{sanitize(state_val)}_{sanitize(tag_str)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}{ext}"
+
+            # Streamed CSVs append each finished chunk to one output per role instead
+            chunk_writer = chunk_pipeline.ChunkWriter(output_dir, settings.stream_queue_chunks) if streaming else None
+            chunk_streams = {}  # tag -> the role's RowStream, kept for the whole streamed run
+
+            def _close_chunk_writer(complete):
+                nonlocal chunk_writer
+                writer, chunk_writer = chunk_writer, None
+                if writer is None:
+                    return  # already closed
+                for out_filename in writer.close(_output_path, complete):
+                    with stats_lock:
+                        stats["files"] += 1
+                        stats["written_files"].append(out_filename.name)
+                for stream in chunk_streams.values():
+                    stream.close()
+
+            def _write_file(df, tag_str, complete = True, stream = None):
+                #WRITE per role — timestamp at finish time to avoid collisions
+                if chunk_writer is not None:
+                    chunk_writer.write(tag_str, df, complete)  # the role's stream stays open for the next chunk
+                    return
+                if stream is not None and not complete:
+                    out_filename = stream.partial_path  # the autosaved partial file becomes the _incomplete output
+                    stream.close(keep_partial=True)
                 else:
-                    df.to_excel(out_filename, index=False, engine="openpyxl")
+                    out_filename = _output_path(tag_str, complete)
+                    output_writer.atomic_save(df, out_filename)
+                    if stream is not None:
+                        stream.close()
                 self.logger.info(f"Successfully wrote '{out_filename.name}'")
-                stats["files"] += 1
-                stats["written_files"].append(out_filename.name)
+                with stats_lock:
+                    stats["files"] += 1
+                    stats["written_files"].append(out_filename.name)
             # Pre-detect all sections to set whole-file progress bar maximum
             all_sheet_sections = {}
             total_rows = 0
             for sheet_name, df in sheets.items():
-                secs = utilities._split_by_duplicate_headers(df, sheet_name, self.logger)
+                secs = [(sheet_name, df)] if streaming else utilities._split_by_duplicate_headers(df, sheet_name, self.logger)
                 all_sheet_sections[sheet_name] = secs
+                if workbook is not None:
+                    total_rows += workbook.rows(sheet_name)
+                    continue
                 for _, sec_df in secs:
                     total_rows += len(sec_df)
+            if streaming:
+                total_rows = max(chunk_pipeline.count_rows(self.file_path) - header_row - 1, total_rows)
+                self.logger.info(f"Large file — streaming about {total_rows} rows in chunks of {settings.stream_chunk_rows}")
             self.root.after(0, lambda t=total_rows: self.progress.config(maximum=max(t, 1), value=0))
             total_global_sections = sum(len(secs) for secs in all_sheet_sections.values())
             global_section_idx = 0
@@ -755,7 +1163,8 @@ class App:
                     return
 
                 # Use pre-detected sections
-                sections = all_sheet_sections[sheet_name]
+                sections = all_sheet_sections.pop(sheet_name)
+                loaded = workbook is None
                 total_sections = len(sections)
 
                 # Process each section (could be just one if no duplicate headers found)
@@ -763,7 +1172,7 @@ class App:
                     global_section_idx += 1
                     if run_id != self.current_run_id:
                         self.logger.info("New file selected — stopping previous run.")
-                        _write_file(False)
+                        _write_file(df, tag_str, False)
                         return
 
                     userChoice = None
@@ -775,10 +1184,10 @@ class App:
                     cols, self.cols = utilities._detect_columns(df)
                     if "County/City" not in cols or "Email" not in cols:
                         for skip in range(1, 5):
-                            if ext == ".csv":
-                                df = pd.read_csv(self.file_path, header=skip)
+                            if ext == ".csv" and not streaming:
+                                df = sheet_reader.read_csv(self.file_path, header=skip)
                             else:
-                                # For sections, we can't re-read from file, skip this optimization
+                                # For sections and streamed files, we can't re-read from file, skip this optimization
                                 break
                             cols, self.cols = utilities._detect_columns(df)
                             if "County/City" in cols and "Email" in cols:
@@ -809,7 +1218,8 @@ class App:
                                     "Email Confidence",
                                     "Alternative Email",
                                     "Alternative Email Confidence",
-                                    "Hunter Email Source"]
+                                    "Hunter Email Source",
+                                    "Last Updated"]
 
                     #Read the data from cols returned by _detect_columns
                     for key in ALL_MAPPED_COLUMNS:
@@ -846,6 +1256,20 @@ class App:
                     if userChoices is None:
                         return  # Cancelled by new file selection or input error
 
+                    if not loaded and self.sheet_role_choices.get(sheet_name) != [0]:
+                        # The dialog only needed the sheet's first rows; parse the whole sheet now that it will be used
+                        loaded = True
+                        full_sections = utilities._split_by_duplicate_headers(workbook.load(sheet_name), sheet_name, self.logger)
+                        total_global_sections += len(full_sections) - len(sections)
+                        # The progress bar was sized from the sheet's stored dimensions; correct it to the rows actually read
+                        extra = sum(len(sec_df) for _, sec_df in full_sections) - workbook.rows(sheet_name)
+                        self.root.after(0, lambda n=extra: self.progress.config(maximum=max(self.progress['maximum'] + n, 1)))
+                        sections[:] = full_sections  # the loop carries on with the full sheet's remaining sections
+                        total_sections = len(sections)
+                        if not sections:
+                            continue
+                        name, df = sections[0]
+
                     # Build CSV filename: stateprovince_tag_datetime.csv
                     tag_map = {1: "NG911", 2: "Mayor", 3: "QQ"}
                     out_filename = None
@@ -865,275 +1289,146 @@ class App:
                     df_original = df.copy()
 
                     def insert_if_missing(df, idx, col_name, default=""):
-                        if col_name.lower() not in [c.lower() for c in df.columns] and not self.column_for.get(col_name):
+                        if self.column_for.get(col_name):
+                            if self.column_for[col_name] not in df.columns:  # mapped by an earlier section
+                                df.insert(idx, self.column_for[col_name], default)
+                            return
+                        existing = next((c for c in df.columns if str(c).lower() == col_name.lower()), None)
+                        if existing is None:
                             df.insert(idx, col_name, default)
-                            self.column_for[col_name] = col_name
+                        self.column_for[col_name] = existing if existing is not None else col_name
+
+                    #Fills in missing columns once, so every role's copy shares the same layout
+                    for col in OUTPUT_COLUMNS:
+                        insert_if_missing(df_original, len(df_original.columns), col)
+
+                    #Fill blank Population cells once per section: gazetteer first, then batched OpenAI lookups
+                    if self.column_for.get("Population"):
+                        self._fill_populations(df_original)
+
+                    def role_tag_str(userChoice):
+                        _role_tag = self.role_tags.get(userChoice)
+                        return (_role_tag[0] if _role_tag else None) or tag_map.get(userChoice, "data")
 
-                    for userChoice in userChoices:
+                    def run_role(userChoice):
+                        """
+                        Search one role against its own copy of the section and write its file as soon as it finishes.
+                        Returns (finished, df, tag_str); finished is False if the run was cancelled.
+                        """
                         df = df_original.copy()  # fresh copy so roles don't overwrite each other
                         role = Role(userChoice)
-                        _role_tag = self.role_tags.get(userChoice)
-                        tag_str = (_role_tag[0] if _role_tag else None) or tag_map.get(userChoice, "data")
+                        tag_str = role_tag_str(userChoice)
                         # out_filename is set at write time using finish timestamp to avoid collisions
 
-                        self.root.after(0, lambda n=name, tag=tag_str, si=section_idx, st=total_sections: (
-                            self.progress_label.config(text=f"Section {si}/{st} — Processing '{n}' ({tag})...", style="Processing.TLabel"),
-                        ))
-
                         if self.column_for["County/City"]:
                             self.logger.info("Looking for counties or cities under column: " + self.column_for["County/City"])
 
-        
+                        #Incremental runs keep rows that already have a strong, recent, sourced contact
+                        keep = self._fresh_rows(df) if self.incremental else pd.Series(False, index=df.index)
+                        if keep.any():
+                            self.logger.info(f"Incremental run: keeping {int(keep.sum())} fresh rows, refreshing the rest")
 
-                        #Fills in missing columns, prevents TypeErrors, and clears old data
+                        #Prevents TypeErrors and clears old data
                         for col in OUTPUT_COLUMNS:
-                            insert_if_missing(df, len(df.columns), col)
                             if self.column_for[col] and self.column_for[col] in df.columns:
                                 if col != "Address Data Owner / Department" or role == Role.GIS:
-                                    df[self.column_for[col]] = ""
+                                    df[self.column_for[col]] = df[self.column_for[col]].astype(object).where(keep, "")
 
                         section_incomplete_notified = False
-                        rows_before = stats["rows"]
+                        role_rows = 0
 
-                        #Search and verify each column
-                        try:
-                            for idx, value in df[self.column_for["County/City"]].items():
-                                if run_id != self.current_run_id:
-                                    _write_file(False)
-                                    return
+                        match role:
+                            case Role.GIS:
+                                system_prompt = self.prompt_gis
+                            case Role.MAYOR:
+                                system_prompt = self.prompt_mayor
+                            case Role.ASSESSOR:
+                                system_prompt = self.prompt_assessor
 
-                                # Skip rows that are mostly empty
-                                non_empty = df.loc[idx].dropna().replace("", pd.NA).dropna()
-                                if len(non_empty) <= 1:
-                                    self.logger.info(f"Skipping mostly empty row {idx}")
-                                    continue
-
-                                # Skip if county/city value is blank or matches header
-                                if pd.isna(value) or str(value).strip() == "" or value == self.column_for["County/City"]:
-                                    continue
+                        worker = functools.partial(self._process_row, run_id, stage_pool, role, userChoice, system_prompt)
 
-                                self.logger.info("Currently on: " + str(value))
-                                stats["rows"] += 1
-                                self.root.after(0, lambda: self.progress.config(
-                                    value=min(self.progress['value'] + 1, self.progress['maximum'])
-                                ))
+                        journaled = (journal.journal.load(file_hash, sheet_name, name, userChoice, (df.index.min(), df.index.max()))
+                                     if resume and file_hash and len(df) else {})
 
-                                match role:
-                                    case Role.GIS:
-                                        system_prompt = self.prompt_gis
-                                    case Role.MAYOR:
-                                        system_prompt = self.prompt_mayor
-                                    case Role.ASSESSOR:
-                                        system_prompt = self.prompt_assessor
-                                
+                        def checkpoint(rows, updates, raw=None):
+                            if file_hash:
                                 try:
-                                    state = df.loc[idx, self.column_for["State"]] if self.column_for.get("State") else ""
-                                    state = "" if pd.isna(state) else str(state)
+                                    journal.journal.record(file_hash, sheet_name, name, userChoice, rows, updates, raw)
                                 except Exception as e:
-                                    self.logger.error(f"Failed to get state for row {idx}: {str(e)}")
-                                    continue
-                                
-                                #Populate population cell
-                                populationCell = df.loc[idx, self.column_for["Population"]]
-                                if pd.isna(populationCell) or populationCell == "" or populationCell == 0:
-                                    try:
-                                        population = openai_hunter_client.search_misc(
-                                            f"{value} {state}".strip(),
-                                            SearchFor.POPULATION
-                                        )
-                                        self.logger.info(f"Found {value} {state} population:" + str(population))
-                                        population = population.replace(",", "").strip()
-                                        try:
-                                            int(population) #Check that OpenAI returned a valid number
-                                            df.loc[idx, self.column_for["Population"]] = population
-                                            self.logger.info(f"Saved {value} {state} population:" + str(population))
-                                        except ValueError:
-                                            self.logger.error(f"Failed to parse population for {value} {state} ({population})")
-                                    except openai.APIConnectionError:
-                                        raise                                
-
+                                    self.logger.warning(f"Could not write checkpoint for rows {rows}: {e}")
+
+                        # Rows reach disk as they finish, not only when the section is written
+                        if chunk_writer is not None:
+                            # Streamed chunks reach the output as they finish, so one side CSV per role is enough
+                            stream = chunk_streams.setdefault(tag_str, output_writer.RowStream(df, _output_path(tag_str, False), None))
+                            stream.df = df
+                        else:
+                            stream = output_writer.RowStream(df, _output_path(tag_str, False), settings.autosave_seconds)
+
+                        def write_result(rows, updates):
+                            nonlocal role_rows
+                            role_rows += len(rows)
+                            with stats_lock:
+                                stats["rows"] += len(rows)
+                            self.root.after(0, lambda n=len(rows): self.progress.config(
+                                value=min(self.progress['value'] + n, self.progress['maximum'])
+                            ))
+                            for row_idx in rows:
+                                for col, val in (updates or {}).items():
+                                    df.loc[row_idx, col] = val
+                                stream.row_done(row_idx)
 
-                                try:
-                                    info = openai_hunter_client.search(#                                             ------------------OpenAI search for person---------------------
-                                        f"{value} {state} Government".strip(),
-                                        role,
-                                        system_prompt
-                                    )
-                                except openai.APIConnectionError:
-                                    raise
-                                
-                                except Exception as e:
-                                    self.logger.error(f"OpenAI search failed for row {idx} ({value}): {str(e)}")
+                        #Search and verify each unique entity once, several at a time, and copy the result to every row that shares it
+                        try:
+                            plan = row_planner.plan_rows(df, self.column_for["County/City"], self.column_for.get("State"),
+                                                         row_planner.mostly_empty(df) | keep)
+                            if plan.skipped > keep.sum():
+                                self.logger.info(f"Skipping {plan.skipped - int(keep.sum())} mostly empty rows")
+                            work, key_for = [], {}
+                            resumed = 0
+                            for key, idx, value, state in plan.work:
+                                rows = plan.entities[key]
+                                if all(row_idx in journaled for row_idx in rows):
+                                    for row_idx in rows:
+                                        write_result([row_idx], self._current_tags(journaled[row_idx], userChoice))
+                                    resumed += len(rows)
                                     continue
-
-                                info = (info or "").strip()
-                                if not info or info == "None" or info is None:
+                                earlier = resolved_entities.get((userChoice, key))
+                                if earlier is not None:
+                                    self.logger.info(f"Reusing earlier result for {value} {state}".strip())
+                                    updates = self._current_tags(self._section_updates(earlier), userChoice)
+                                    write_result(rows, updates)
+                                    checkpoint(rows, updates)
                                     continue
+                                key_for[idx] = key
+                                work.append((idx, value, state, df.loc[idx].to_dict()))
+                            if resumed:
+                                self.logger.info(f"Resumed {resumed} rows from the checkpoint journal")
+                            if len(work) < plan.rows:
+                                self.logger.info(f"{plan.rows} rows to search, {len(work)} unique entities")
+
+                            for (idx, *_), result in row_executor.run_ordered(row_pool, work, worker, max(settings.max_concurrent_rows, 1) * 2):
+                                if run_id != self.current_run_id:
+                                    _write_file(df, tag_str, False, stream)
+                                    return False, df, tag_str
 
-                                try:
-                                    parsedInfo = json.loads(info)
-                                except json.JSONDecodeError:
-                                    self.logger.info(f"OpenAI returned non-JSON for row {idx} ({value}), skipping.")
+                                key = key_for[idx]
+                                if result is None:
+                                    write_result(plan.entities[key], None)
                                     continue
 
-                                try:
-                                    #Add the new name, email, role, phone number, and info source
-                                    df.loc[idx, self.column_for["First Name"]] = parsedInfo.get("firstName", "")
-                                    df.loc[idx, self.column_for["Last Name"]] = parsedInfo.get("lastName", "")
-                                    df.loc[idx, self.column_for["Email"]] = parsedInfo.get("email", "")
-                                    df.loc[idx, self.column_for["Phone Number"]] = re.sub(r"[\s().,+]", "", parsedInfo.get("phoneNumber", ""))
-                                    df.loc[idx, self.column_for["Role/Title"]] = parsedInfo.get("role", "")
-                                    df.loc[idx, "Email Domain"] = parsedInfo.get("emailDomain", "")
-                                    _tag, _contact_tag = self.role_tags.get(userChoice, (None, None))
-                                    df.loc[idx, self.column_for["Tag"]] = _tag
-                                    df.loc[idx, self.column_for["Contact Tag"]] = _contact_tag
-                                    if self.column_for.get("Source"):
-                                        df.loc[idx, self.column_for["Source"]] = parsedInfo.get("sourceWebsite", "")
-
-                                    if role == Role.GIS and self.column_for.get("Address Data Owner / Department"):
-                                        df.loc[idx, self.column_for["Address Data Owner / Department"]] = parsedInfo.get("addressDepartment", "")
-
-                                    state_mapping = {item: label for lst, label in stateCorrectionMap.items() for item in lst}
-                                    
-                                    #Correct state format
-                                    if self.column_for.get("State"):
-                                        _raw_state = df.loc[idx, self.column_for["State"]]
-                                        thisState = str(_raw_state).strip().lower() if not pd.isna(_raw_state) else ""
-                                        if thisState and thisState in state_mapping:
-                                            df.loc[idx, self.column_for["State"]] = state_mapping.get(thisState.lower())
-                                            if self.column_for.get("Contact State"):
-                                                df.loc[idx, self.column_for["Contact State"]] = state_mapping.get(thisState.lower())
-                                        elif thisState and thisState[0:2] in state_mapping:
-                                            df.loc[idx, self.column_for["State"]] = state_mapping.get(thisState[0:2].lower())
-                                            if self.column_for.get("Contact State"):
-                                                df.loc[idx, self.column_for["Contact State"]] = state_mapping.get(thisState[0:2].lower())
-
-                                    reFind = False
-                                    email_val = parsedInfo.get("email")
-                                    email_type = parsedInfo.get("emailType")
-                                    incompleteEmailArtifacts = ["*", "protected", "info@", "contact@", "gis@", "assessor", "pa@", "ecta@", "administration", "admin@", "office@"]
-                                    if email_val and isinstance(email_val, str):
-                                        reFind = any([c in email_val.lower() for c in incompleteEmailArtifacts]) or email_val.lower() == "none" or email_type != "person"
-                                    verifyNeeded = bool(email_val) and email_type == "person" and email_val != "None" and not reFind
-                                    #Verify personal emails found
-                                    if verifyNeeded:
-                                        try:
-                                            res = openai_hunter_client.verify_email(email_val)
-                                            while str(res[0]) == "202" and attempt_count <= 5: #"The email verification is still in progress. To avoid the request running for too long we return HTTP 202 responses."
-                                                res = openai_hunter_client.verify_email(email_val)
-                                                attempt_count += 1
-                                            if str(res[0]) == "200":
-                                                verification_data = res[1].get("data")
-                                                if verification_data:
-                                                    score = verification_data.get("score", -1)
-                                                    status = verification_data.get("status")
-                                                    sources = verification_data.get("sources", [])
-                                                    source = sources[0]["uri"] if sources else ""
-                                                    self.logger.info("Data found by hunter.io:")
-                                                    self.logger.info("Status: " + status)
-                                                    if score >= 0:
-                                                        self.logger.info("Score: " + str(score))
-                                                        df.loc[idx, "Email Confidence"] = str(score)
-                                                        df.loc[idx, "Hunter Email Source"] = source
-                                                        self.logger.info("Source: " +  source)
-                                                        if score < 80:
-                                                            reFind = True
-                                                            self.logger.info("Confidence score is too low, attempting to search again")
-                                                else:
-                                                    self.logger.error("Hunter.io did not return data")
-                                                    
-                                            elif str(res[0]) == "400":
-                                                errors = res[1].get("errors") or []
-                                                if errors and errors[0].get("id") == "invalid_email":
-                                                    reFind = True
-                                            else:
-                                                self.logger.warning("Hunter.io Verify API Call Failed")
-                                        except Exception as e:
-                                            self.logger.warning(f"Hunter.io verify_email API error (skipping): {str(e)}")
-                                            # Continue processing without verification
-
-                                    #Search for personal email if department email or no email was returned
-                                    first_name = parsedInfo.get("firstName")
-                                    last_name = parsedInfo.get("lastName")
-                                    gov_site = parsedInfo.get("govWebsite")
-                                    if (not verifyNeeded or reFind) and first_name and last_name and first_name.lower() not in ["none", "gis", "tax", "appraiser"] and last_name.lower() not in ["none", "gis", "tax", "team", "appraiser"] and gov_site:
-                                        try:
-                                            res = openai_hunter_client.find_email(first_name, last_name, gov_site)
-                                            attempt_count = 1
-                                            while str(res[0]) == "202" and attempt_count <= 5: #"The email verification is still in progress. To avoid the request running for too long we return HTTP 202 responses."
-                                                res = openai_hunter_client.find_email(first_name, last_name, gov_site)
-                                                attempt_count += 1
-                                            if str(res[0]) == "200":
-                                                parsedHunterResponse = res[1].get("data")
-                                                if parsedHunterResponse:
-                                                    email = parsedHunterResponse.get("email")
-                                                    if email is not None:
-                                                        score = parsedHunterResponse["score"]
-                                                        sources = parsedHunterResponse.get("sources", [])
-                                                        number = parsedHunterResponse.get("phone_number")
-                                                        linkedin = parsedHunterResponse.get("linkedin_url")
-                                                        source = sources[0]["uri"] if sources else ""
-                                                        self.logger.info("Data found by hunter.io:")
-                                                        self.logger.info("email: " + email)
-                                                        self.logger.info("score: " + str(score))
-                                                        self.logger.info("source: " + source)
-                                                        if (reFind and score >= 90) or (not pd.isna(df.loc[idx, "Email Confidence"]) and str(df.loc[idx, "Email Confidence"]).strip() != "" and score > int(df.loc[idx, "Email Confidence"])) or pd.isna(df.loc[idx, self.column_for["Email"]]) or df.loc[idx, self.column_for["Email"]] == "" or df.loc[idx, self.column_for["Email"]] == 0:
-                                                            self.logger.info(f"Saving hunter.io email {email} to email column, moving original email to Alternative Email column")
-                                                            df.loc[idx, "Alternative Email"] = df.loc[idx, self.column_for["Email"]]
-                                                            df.loc[idx, "Alternative Email Confidence"] = df.loc[idx, "Email Confidence"]   
-                                                            df.loc[idx, self.column_for["Email"]] = email
-                                                            df.loc[idx, "Email Confidence"] = str(score)
-                                                            df.loc[idx, "Hunter Email Source"] = source
-                                                            df.loc[idx, self.column_for["LinkedIn"]] = linkedin
-                                                            if (pd.isna(df.loc[idx, self.column_for["Phone Number"]]) or df.loc[idx, self.column_for["Phone Number"]] == 0) and number != 0 and number is not None:
-                                                                df.loc[idx, self.column_for["Phone Number"]] = number
-                                                        elif score>=70:
-                                                            self.logger.info(f"Saving hunter.io email {email} to Alternative Email column")
-                                                            df.loc[idx, "Alternative Email"] = email
-                                                            df.loc[idx, "Alternative Email Confidence"] = str(score)
-                                                            df.loc[idx, "Hunter Email Source"] = source
-                                                            df.loc[idx, self.column_for["LinkedIn"]] = linkedin
-                                                            if (pd.isna(df.loc[idx, self.column_for["Phone Number"]]) or df.loc[idx, self.column_for["Phone Number"]] == 0) and number != 0 and number is not None:
-                                                                df.loc[idx, self.column_for["Phone Number"]] = number
-                                                        else:
-                                                            self.logger.info(f"Hunter.io email score less than 70, too low to save ({score}): {email}")
-                                                    else:
-                                                        self.logger.info("Hunter.io did not find an email for " + first_name + " " + last_name)
-                                                else:
-                                                    self.logger.error("Hunter.io did not return data")
-                                            else:
-                                                self.logger.info("Hunter.io Find API Call Failed")
-                                        except Exception as e:
-                                            self.logger.warning(f"Hunter.io find_email API error (skipping): {str(e)}")
-                                            # Continue processing without finding alternative email
-
-                                    #Generate LinkedIn Outreach Message
-                                    if first_name and last_name and parsedInfo.get("role"):
-                                        try:
-                                            linkedinOutreachMessage = openai_hunter_client.search_misc(
-                                                f"{value} {state}".strip(),
-                                                SearchFor.OUTREACH_MESSAGE,
-                                                f"{first_name} {last_name}",
-                                                role,
-                                                f"{value} {state}"
-                                            )
-                                            if linkedinOutreachMessage:
-                                                df.loc[idx, self.column_for["Contact LinkedIn Outreach Message"]] = linkedinOutreachMessage
-                                                self.logger.info(f"Generated and saved {value} {state} linkedinOutreachMessage:" + str(linkedinOutreachMessage))
-                                        except openai.APIConnectionError:
-                                            raise
-
-
-                                except TypeError as e:
-                                    #This should not happen
-                                    self.logger.error("TypeError:" + str(e))
-                                    self.logger.warning("You may be missing a row of data in the output.")
-                                    if not section_incomplete_notified:
-                                        section_incomplete_notified = True
-                                        self.root.after(0, lambda n=name, tag=tag_str: messagebox.showwarning(
-                                            "Incomplete Data",
-                                            f"Data is incomplete for section '{n}' ({tag}) and must be rerun."
-                                        ))
+                                updates, incomplete, raw = result
+                                if not incomplete:
+                                    resolved_entities[(userChoice, key)] = self._logical_updates(updates)
+                                    checkpoint(plan.entities[key], updates, raw)
+                                write_result(plan.entities[key], updates)
+
+                                if incomplete and not section_incomplete_notified:
+                                    section_incomplete_notified = True
+                                    self.root.after(0, lambda n=name, tag=tag_str: messagebox.showwarning(
+                                        "Incomplete Data",
+                                        f"Data is incomplete for section '{n}' ({tag}) and must be rerun."
+                                    ))
 
                         except Exception as e:
                             self.logger.error("Error: " + str(e))
@@ -1145,16 +1440,52 @@ class App:
                                     "Incomplete Data",
                                     f"Data is incomplete for section '{n}' ({tag}) and must be rerun."
                                 ))
-                            if stats["rows"] == rows_before:
+                            if role_rows == 0:
                                 self.logger.warning(f"No processable rows found in section '{name}' ({tag_str})")
-                            _write_file(False)
-                            continue
+                            _write_file(df, tag_str, False, stream)
+                            return True, df, tag_str
 
-                        if stats["rows"] == rows_before:
+                        if role_rows == 0:
                             self.logger.warning(f"No processable rows found in section '{name}' ({tag_str})")
-                        _write_file(True)
+                        # Rows that must be rerun keep the file marked _incomplete
+                        _write_file(df, tag_str, not section_incomplete_notified, stream)
+                        return True, df, tag_str
+
+                    self.root.after(0, lambda n=name, tags=", ".join(role_tag_str(c) for c in userChoices), si=section_idx, st=total_sections: (
+                        self.progress_label.config(text=f"Section {si}/{st} — Processing '{n}' ({tags})...", style="Processing.TLabel"),
+                    ))
+
+                    section_columns, layout = list(df.columns), list(df_original.columns)
+                    while True:
+                        # Roles run side by side and share row_pool/stage_pool, so together they stay within one concurrency budget
+                        with ThreadPoolExecutor(max_workers=len(userChoices), thread_name_prefix="role") as role_pool:
+                            role_results = list(role_pool.map(run_role, userChoices))
+                        _, df, tag_str = role_results[-1]
+                        if not all(finished for finished, _, _ in role_results):
+                            return
+
+                        # A streamed CSV carries on with its next chunk, under the same roles and column layout
+                        chunk = next(chunks, None) if streaming else None
+                        if chunk is None:
+                            break
+                        if run_id != self.current_run_id:
+                            return
+                        chunk.columns = section_columns
+                        chunk.index -= header_row + 1
+                        for col in layout[len(section_columns):]:
+                            chunk[col] = ""
+                        df_original = chunk
+                        if self.column_for.get("Population"):
+                            self._fill_populations(df_original)
+                        self.root.after(0, lambda n=name, first=df_original.index[0] + 1, last=df_original.index[-1] + 1: (
+                            self.progress_label.config(text=f"Processing '{n}' rows {first}–{last}...", style="Processing.TLabel"),
+                        ))
 
+            if chunk_writer is not None:
+                _close_chunk_writer(True)
             self.logger.info(f"Run complete — {stats['rows']} rows processed, {stats['files']} file(s) written.")
+            if file_hash and not any("_incomplete" in f for f in stats["written_files"]):
+                journal.journal.clear(file_hash)  # nothing left to resume
             
             files_text = (
                 f"No files written from {Path(self.file_path).name}" if stats["written_files"] == [] else "Files written: " + ", ".join(stats["written_files"]) + "\n" + f"\nfrom {Path(self.file_path).name}"
@@ -1192,6 +1523,15 @@ class App:
             ))
         
         finally:
+            if 'row_pool' in locals():
+                row_pool.shutdown(wait=False, cancel_futures=True)
+                stage_pool.shutdown(wait=False, cancel_futures=True)
+            if 'chunks' in locals():
+                chunks.close()
+            if locals().get('workbook') is not None:
+                workbook.close()
+            if locals().get('chunk_writer') is not None:
+                _close_chunk_writer(False)  # whatever was streamed so far is kept as _incomplete
             if 'file_handler' in locals():
                 self.logger.removeHandler(file_handler)
                 file_handler.close()
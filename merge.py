@@ -1,5 +1,6 @@
 import threading
 import pandas as pd
+import sheet_reader
 from datetime import datetime
 from pathlib import Path
 import tkinter as tk
@@ -37,8 +38,7 @@ def open_merge_tool(root, apply_theme_fn):
         if not path:
             return
         try:
-            ext = Path(path).suffix.lower()
-            df = pd.read_csv(path) if ext == ".csv" else pd.read_excel(path)
+            df = sheet_reader.read_table(path)
         except Exception as e:
             messagebox.showerror("Error", f"Could not read file:\n{e}", parent=win)
             return
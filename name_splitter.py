@@ -1,5 +1,6 @@
 import threading
 import pandas as pd
+import sheet_reader
 from pathlib import Path
 from datetime import datetime
 import tkinter as tk
@@ -59,8 +60,7 @@ def open_name_splitter(root, apply_theme_fn):
         if not path:
             return
         try:
-            ext = Path(path).suffix.lower()
-            df = pd.read_csv(path) if ext == ".csv" else pd.read_excel(path)
+            df = sheet_reader.read_table(path)
         except Exception as e:
             messagebox.showerror("Error", f"Could not read file:\n{e}", parent=win)
             return
@@ -97,7 +97,7 @@ def open_name_splitter(root, apply_theme_fn):
             try:
                 path = state["file_path"]
                 ext = Path(path).suffix.lower()
-                df = pd.read_csv(path) if ext == ".csv" else pd.read_excel(path)
+                df = sheet_reader.read_table(path)
 
                 def split(val):
                     parts = str(val).strip().split(" ", 1) if pd.notna(val) and str(val).strip() else ["", ""]
@@ -1,19 +1,28 @@
 from settings import settings
+import openai
 from openai import OpenAI, Timeout
 import requests
 from presets import Role, SearchFor
+import rate_limiter
+from cache import DAY, cached, make_key, prompt_hash, single_flight
 import logging
+import json
 import re
 
 logger = logging.getLogger(__name__)
+# The SDK does not retry: _chat does, so every 429 reaches openai_concurrency and cuts the in-flight cap
 client = OpenAI(api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url,
                 timeout=Timeout(60, connect=10),
-    max_retries=4,)
+    max_retries=0,)
+CHAT_RETRIES = 4
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
 
-def search(prompt: str, role: Role, system_prompt: str) -> str:
-    logger.info(f"Calling OpenAI to search for {role} in {prompt}")
-    message=[]
+SEARCH_MODEL = "gpt-4o-mini-search-preview"
+DOMAIN_SYSTEM_PROMPT = "You find the official website domain for organizations. Reply with only the bare domain (e.g. 'example.com'), no protocol, www, or path. If you cannot find it, reply exactly: unknown"
 
+
+def _search_messages(prompt: str, role: Role, system_prompt: str) -> list:
     if role == Role.ASSESSOR:
         message=[{"role": "system", 
                     "content": system_prompt + settings.prompt_format_assessor}]
@@ -26,23 +35,9 @@ def search(prompt: str, role: Role, system_prompt: str) -> str:
         "role": "user",
         "content": prompt
     })
+    return message
 
-    chat = client.chat.completions.create(
-        model="gpt-4o-mini-search-preview",
-        messages=message,
-        max_tokens = settings.max_tokens,
-    )
-    
-    print(chat)
-    if not chat.choices:
-        logger.error("Empty response from OpenAI")
-        return None
-    logger.info(chat.choices[0].message.content)
-    return chat.choices[0].message.content
-
-def search_misc(prompt: str, searchType: SearchFor, name="", role="", company="") -> str: #for searching population, etc
-    logger.info(f"Calling OpenAI to search for {prompt}")
-
+def _misc_messages(prompt: str, searchType: SearchFor) -> list:
     match searchType:
         case SearchFor.POPULATION:
             message=[{"role": "system", "content": settings.prompt_find_population}]
@@ -53,12 +48,100 @@ def search_misc(prompt: str, searchType: SearchFor, name="", role="", company=""
         
 
     message.append({"role": "user", "content": prompt})
+    return message
+
+def _domain_messages(org_name: str) -> list:
+    return [
+        {"role": "system", "content": DOMAIN_SYSTEM_PROMPT},
+        {"role": "user", "content": f"What is the official website domain for this organization: {org_name}"}
+    ]
+
+def _parse_domain(content: str):
+    result = content.strip().lower()
+    result = re.sub(r'^https?://', '', result)
+    result = re.sub(r'^www\.', '', result)
+    result = result.split('/')[0].split('?')[0].strip()
+    if '.' in result and result != 'unknown':
+        logger.info(f"OpenAI found domain: {result}")
+        return result
+    return None
+
+def _call(endpoint: str, tokens: int, create):
+    """
+    Run one OpenAI request, create(), against the shared rate budget for `endpoint`.
+    429s, dropped connections and 5xx are retried up to CHAT_RETRIES times, each attempt in its own slot.
+    """
+    for attempt in range(1, CHAT_RETRIES + 2):
+        rate_limiter.acquire(endpoint, tokens)
+        try:
+            with rate_limiter.openai_concurrency.slot():
+                return create()
+        except RETRYABLE_ERRORS:
+            if attempt > CHAT_RETRIES:
+                raise
+            rate_limiter.backoff(attempt)
+
+def _chat(messages: list, max_tokens: int):
+    """Every chat completion goes through here so it is counted against the shared rate budget."""
+    return _call(rate_limiter.CHAT_COMPLETIONS, rate_limiter.estimate_tokens(messages, max_tokens),
+                 lambda: client.chat.completions.create(
+                     model=SEARCH_MODEL,
+                     messages=messages,
+                     max_tokens=max_tokens,
+                 ))
+
+def _hunter_get(endpoint: str, url: str, timeout: int):
+    rate_limiter.acquire(endpoint)
+    with rate_limiter.hunter_concurrency.slot() as slot:
+        response = requests.get(url, timeout=timeout)
+        slot.throttled = response.status_code == 429
+        return response
+
+def _search_cacheable(answer) -> bool:
+    """Only a JSON object or a deliberate "None" is cached; truncated or prose replies are asked again next run."""
+    answer = (answer or "").strip()
+    if answer == "None":
+        return True
+    try:
+        return isinstance(json.loads(answer), dict)
+    except json.JSONDecodeError:
+        return False
+
+def search(prompt: str, role: Role, system_prompt: str) -> str:
+    message = _search_messages(prompt, role, system_prompt)
+    # The full system prompt (including the format prompt) is hashed into the key, so editing a prompt in Settings misses the cache
+    key = make_key(prompt, role.name, prompt_hash(message[0]["content"]), SEARCH_MODEL)
+    return cached("search", key, settings.search_cache_ttl_days * DAY,
+                  lambda: _search(prompt, role, message), store_if=_search_cacheable)
+
+def _search(prompt: str, role: Role, message: list) -> str:
+    logger.info(f"Calling OpenAI to search for {role} in {prompt}")
+    chat = _chat(message, settings.max_tokens)
+    
+    print(chat)
+    if not chat.choices:
+        logger.error("Empty response from OpenAI")
+        return None
+    logger.info(chat.choices[0].message.content)
+    return chat.choices[0].message.content
+
+def _outreach_key(prompt: str, name, role, company) -> str:
+    """Outreach messages are reused while the contact and the outreach prompt stay the same."""
+    role = getattr(role, "name", role)
+    return make_key(*(" ".join(str(part or "").lower().split()) for part in (name, role, company, prompt)),
+                    prompt_hash(settings.prompt_find_outreach_message), SEARCH_MODEL)
+
+def search_misc(prompt: str, searchType: SearchFor, name="", role="", company="") -> str: #for searching population, etc
+    message = _misc_messages(prompt, searchType)
+    if searchType == SearchFor.OUTREACH_MESSAGE:
+        return cached("outreach", _outreach_key(prompt, name, role, company), settings.outreach_cache_ttl_days * DAY,
+                      lambda: _search_misc(prompt, message), store_if=bool)
+    # Not cached (population and GIS-department answers go stale), but identical calls in flight are still joined
+    return single_flight(("misc", make_key(message)), lambda: _search_misc(prompt, message))
 
-    chat = client.chat.completions.create(
-        model="gpt-4o-mini-search-preview",
-        messages=message,
-        max_tokens = settings.max_tokens,
-    )
+def _search_misc(prompt: str, message: list) -> str:
+    logger.info(f"Calling OpenAI to search for {prompt}")
+    chat = _chat(message, settings.max_tokens)
     
     print(chat)
     if not chat.choices:
@@ -67,48 +150,130 @@ def search_misc(prompt: str, searchType: SearchFor, name="", role="", company=""
     logger.info(chat.choices[0].message.content)
     return chat.choices[0].message.content
 
+POPULATION_BATCH_INSTRUCTIONS = "\n\nYou will be given several places, one per line. Reply with only a JSON object that maps each place, exactly as written, to its population as a plain integer, or null if you cannot find it."
+
+def search_population_batch(places: list) -> dict:
+    """Look up the population of several places in one call. Returns {place: population or None}."""
+    logger.info(f"Calling OpenAI to search for the population of {len(places)} places")
+    message = [
+        {"role": "system", "content": settings.prompt_find_population + POPULATION_BATCH_INSTRUCTIONS},
+        {"role": "user", "content": "\n".join(places)},
+    ]
+    chat = _chat(message, 50 + 20 * len(places))
+    if not chat.choices:
+        logger.error("Empty response from OpenAI")
+        return {}
+    content = chat.choices[0].message.content or ""
+    logger.info(content)
+    content = re.sub(r"^```(?:json)?|```$", "", content.strip()).strip()
+    return json.loads(content)
+
+def _normalize_org(org_name: str) -> str:
+    return " ".join(re.sub(r"[^\w\s&-]", " ", str(org_name or "").lower()).split())
+
+def _domain_ttl(domain) -> float:
+    return (settings.domain_cache_ttl_days if domain else settings.domain_negative_ttl_days) * DAY
+
 def find_domain(org_name: str):
-    """Ask OpenAI to find the official website domain for an organization by name."""
-    logger.info(f"Asking OpenAI for domain of: {org_name}")
+    """
+    Ask OpenAI to find the official website domain for an organization by name.
+    Answers, including "unknown", are cached per normalized organization name.
+    """
     try:
-        chat = client.chat.completions.create(
-            model="gpt-4o-mini-search-preview",
-            messages=[
-                {"role": "system", "content": "You find the official website domain for organizations. Reply with only the bare domain (e.g. 'example.com'), no protocol, www, or path. If you cannot find it, reply exactly: unknown"},
-                {"role": "user", "content": f"What is the official website domain for this organization: {org_name}"}
-            ],
-            max_tokens=50,
-        )
-        if not chat.choices:
-            return None
-        result = chat.choices[0].message.content.strip().lower()
-        result = re.sub(r'^https?://', '', result)
-        result = re.sub(r'^www\.', '', result)
-        result = result.split('/')[0].split('?')[0].strip()
-        if '.' in result and result != 'unknown':
-            logger.info(f"OpenAI found domain: {result}")
-            return result
-        return None
+        # "" is a cached "unknown"; failed calls raise and are not cached
+        domain = cached("domain", make_key(_normalize_org(org_name)), _domain_ttl, lambda: _find_domain(org_name))
+        return domain or None
     except Exception as e:
         logger.warning(f"find_domain failed for '{org_name}': {e}")
         return None
 
+def _find_domain(org_name: str) -> str:
+    logger.info(f"Asking OpenAI for domain of: {org_name}")
+    chat = _chat(_domain_messages(org_name), 50)
+    if not chat.choices:
+        raise ValueError("Empty response from OpenAI")
+    return _parse_domain(chat.choices[0].message.content) or ""
+
+
+def _normalize_domain(domain) -> str:
+    domain = str(domain or "").strip().lower()
+    domain = re.sub(r'^https?://', '', domain)
+    domain = re.sub(r'^www\.', '', domain)
+    return domain.split('/')[0]
+
+def _email_finder_key(firstName, lastName, domain) -> str:
+    return make_key(str(firstName or "").strip().lower(), str(lastName or "").strip().lower(), _normalize_domain(domain))
+
+def _email_finder_ttl(res) -> float:
+    found = (res[1].get("data") or {}).get("email")
+    return (settings.email_finder_cache_ttl_days if found else settings.email_finder_negative_ttl_days) * DAY
 
 def find_email(firstName, lastName, domain):
+    """
+    Hunter.io Email Finder. Completed (200) answers are cached per normalized name + domain,
+    including "no email found", so repeat lookups skip the network and the 202 retry loop.
+    """
+    res = cached("email_finder", _email_finder_key(firstName, lastName, domain), _email_finder_ttl,
+                 lambda: _find_email(firstName, lastName, domain),
+                 store_if=lambda res: str(res[0]) == "200")
+    return tuple(res)
+
+def _find_email(firstName, lastName, domain):
     logger.info(f"Called Hunter.io Email Finding API for: {firstName} {lastName}, {domain}")
 
-    findURL = f"https://api.hunter.io/v2/email-finder?domain={domain}&first_name={firstName}&last_name={lastName}&api_key={settings.hunter_api_key}"
-    response = requests.get(findURL, timeout=40)
+    findURL = f"{settings.hunter_api_base}/email-finder?domain={domain}&first_name={firstName}&last_name={lastName}&api_key={settings.hunter_api_key}"
+    response = _hunter_get(rate_limiter.HUNTER_EMAIL_FINDER, findURL, 40)
     logger.info(response.status_code)
     logger.info(response.json())
 
     return (response.status_code, response.json())
 
+def domain_search(domain, limit=100, offset=0):
+    """
+    Hunter.io Domain Search: one page of the emails Hunter knows at a domain, plus its naming pattern.
+    Completed (200) pages are cached per normalized domain, page size and offset.
+    """
+    res = cached("domain_search", make_key(_normalize_domain(domain), limit, offset), settings.domain_search_cache_ttl_days * DAY,
+                 lambda: _domain_search(domain, limit, offset),
+                 store_if=lambda res: str(res[0]) == "200")
+    return tuple(res)
+
+def _domain_search(domain, limit, offset):
+    logger.info(f"Called Hunter.io Domain Search API for: {domain} (offset {offset})")
+
+    searchURL = f"{settings.hunter_api_base}/domain-search?domain={domain}&limit={limit}&offset={offset}&api_key={settings.hunter_api_key}"
+    response = _hunter_get(rate_limiter.HUNTER_DOMAIN_SEARCH, searchURL, 40)
+    logger.info(response.status_code)
+
+    return (response.status_code, response.json())
+
+def _verification_to_cache(res):
+    """Keep only what callers read from a verification: status, score and sources (or the 400 errors)."""
+    status, body = res
+    if str(status) == "200":
+        data = body.get("data") or {}
+        return [status, {"data": {k: data[k] for k in ("status", "score", "sources") if k in data}}]
+    return [status, {"errors": body.get("errors") or []}]
+
+def _verification_cacheable(res) -> bool:
+    # 200s, and 400 invalid_email (a malformed address stays malformed); never 202 "still in progress"
+    if str(res[0]) == "200":
+        return bool(res[1].get("data"))
+    errors = res[1].get("errors") or [{}]
+    return str(res[0]) == "400" and errors[0].get("id") == "invalid_email"
+
 def verify_email(email):
+    """Hunter.io Email Verifier, cached per lower-cased address for email_verifier_cache_ttl_days."""
+    res = cached("email_verifier", make_key(str(email or "").strip().lower()), settings.email_verifier_cache_ttl_days * DAY,
+                 lambda: _verify_email(email),
+                 store_if=_verification_cacheable, encode=_verification_to_cache)
+    return tuple(res)
+
+def _verify_email(email):
     logger.info(f"Called Hunter.io Email Verification API for: {email}")
 
-    validateURL = "https://api.hunter.io/v2/email-verifier?email=" + email + "&api_key=" + settings.hunter_api_key
-    response = requests.get(validateURL, timeout=30)
+    validateURL = f"{settings.hunter_api_base}/email-verifier?email=" + email + "&api_key=" + settings.hunter_api_key
+    response = _hunter_get(rate_limiter.HUNTER_EMAIL_VERIFIER, validateURL, 30)
     logger.info(response.status_code)
     logger.info(response.json())
 
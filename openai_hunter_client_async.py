@@ -0,0 +1,149 @@
+"""
+Async twin of openai_hunter_client. Same functions, same return shapes, but built on
+AsyncOpenAI and one shared httpx.AsyncClient for Hunter.io, so callers can
+asyncio.gather hundreds of lookups without a thread per request.
+
+Point settings.openai_base_url / settings.hunter_api_base at a local server to run it
+against fakes.
+"""
+from settings import settings
+import asyncio
+from openai import AsyncOpenAI, Timeout
+import httpx
+from presets import Role, SearchFor
+import rate_limiter
+from cache import DAY, acached, asingle_flight, make_key, prompt_hash
+from openai_hunter_client import SEARCH_MODEL, CHAT_RETRIES, RETRYABLE_ERRORS, _search_messages, _misc_messages, _domain_messages, _parse_domain, _email_finder_key, _email_finder_ttl, _verification_cacheable, _verification_to_cache, _normalize_org, _domain_ttl, _outreach_key, _normalize_domain, _search_cacheable
+import logging
+
+logger = logging.getLogger(__name__)
+client = AsyncOpenAI(api_key=settings.openai_api_key,
+                     base_url=settings.openai_base_url,
+                     timeout=Timeout(60, connect=10),
+                     max_retries=0)  # _chat retries, so each 429 is seen by openai_concurrency
+http = httpx.AsyncClient(base_url=settings.hunter_api_base,
+                         timeout=httpx.Timeout(40, connect=10),
+                         limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+
+
+async def _chat(messages: list, max_tokens: int):
+    for attempt in range(1, CHAT_RETRIES + 2):
+        await rate_limiter.acquire_async(rate_limiter.CHAT_COMPLETIONS, rate_limiter.estimate_tokens(messages, max_tokens))
+        try:
+            async with rate_limiter.openai_concurrency.aslot():
+                return await client.chat.completions.create(
+                    model=SEARCH_MODEL,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                )
+        except RETRYABLE_ERRORS:
+            if attempt > CHAT_RETRIES:
+                raise
+            await asyncio.sleep(rate_limiter.backoff_seconds(attempt))
+
+async def _hunter_get(endpoint: str, path: str, params: dict, timeout=httpx.USE_CLIENT_DEFAULT):
+    await rate_limiter.acquire_async(endpoint)
+    async with rate_limiter.hunter_concurrency.aslot() as slot:
+        response = await http.get(path, params=params, timeout=timeout)
+        slot.throttled = response.status_code == 429
+        return response
+
+async def search(prompt: str, role: Role, system_prompt: str) -> str:
+    message = _search_messages(prompt, role, system_prompt)
+    key = make_key(prompt, role.name, prompt_hash(message[0]["content"]), SEARCH_MODEL)
+    return await acached("search", key, settings.search_cache_ttl_days * DAY,
+                         lambda: _search(prompt, role, message), store_if=_search_cacheable)
+
+async def _search(prompt: str, role: Role, message: list) -> str:
+    logger.info(f"Calling OpenAI to search for {role} in {prompt}")
+    chat = await _chat(message, settings.max_tokens)
+    if not chat.choices:
+        logger.error("Empty response from OpenAI")
+        return None
+    logger.info(chat.choices[0].message.content)
+    return chat.choices[0].message.content
+
+async def search_misc(prompt: str, searchType: SearchFor, name="", role="", company="") -> str:
+    message = _misc_messages(prompt, searchType)
+    if searchType == SearchFor.OUTREACH_MESSAGE:
+        return await acached("outreach", _outreach_key(prompt, name, role, company), settings.outreach_cache_ttl_days * DAY,
+                             lambda: _search_misc(prompt, message), store_if=bool)
+    return await asingle_flight(("misc", make_key(message)), lambda: _search_misc(prompt, message))
+
+async def _search_misc(prompt: str, message: list) -> str:
+    logger.info(f"Calling OpenAI to search for {prompt}")
+    chat = await _chat(message, settings.max_tokens)
+    if not chat.choices:
+        logger.error("Empty response from OpenAI")
+        return None
+    logger.info(chat.choices[0].message.content)
+    return chat.choices[0].message.content
+
+async def find_domain(org_name: str):
+    """Ask OpenAI to find the official website domain for an organization by name."""
+    try:
+        domain = await acached("domain", make_key(_normalize_org(org_name)), _domain_ttl, lambda: _find_domain(org_name))
+        return domain or None
+    except Exception as e:
+        logger.warning(f"find_domain failed for '{org_name}': {e}")
+        return None
+
+async def _find_domain(org_name: str) -> str:
+    logger.info(f"Asking OpenAI for domain of: {org_name}")
+    chat = await _chat(_domain_messages(org_name), 50)
+    if not chat.choices:
+        raise ValueError("Empty response from OpenAI")
+    return _parse_domain(chat.choices[0].message.content) or ""
+
+async def find_email(firstName, lastName, domain):
+    res = await acached("email_finder", _email_finder_key(firstName, lastName, domain), _email_finder_ttl,
+                        lambda: _find_email(firstName, lastName, domain),
+                        store_if=lambda res: str(res[0]) == "200")
+    return tuple(res)
+
+async def _find_email(firstName, lastName, domain):
+    logger.info(f"Called Hunter.io Email Finding API for: {firstName} {lastName}, {domain}")
+    response = await _hunter_get(rate_limiter.HUNTER_EMAIL_FINDER, "/email-finder", {
+        "domain": domain,
+        "first_name": firstName,
+        "last_name": lastName,
+        "api_key": settings.hunter_api_key,
+    })
+    logger.info(response.status_code)
+    logger.info(response.json())
+    return (response.status_code, response.json())
+
+async def domain_search(domain, limit=100, offset=0):
+    res = await acached("domain_search", make_key(_normalize_domain(domain), limit, offset), settings.domain_search_cache_ttl_days * DAY,
+                        lambda: _domain_search(domain, limit, offset),
+                        store_if=lambda res: str(res[0]) == "200")
+    return tuple(res)
+
+async def _domain_search(domain, limit, offset):
+    logger.info(f"Called Hunter.io Domain Search API for: {domain} (offset {offset})")
+    response = await _hunter_get(rate_limiter.HUNTER_DOMAIN_SEARCH, "/domain-search", {
+        "domain": domain,
+        "limit": limit,
+        "offset": offset,
+        "api_key": settings.hunter_api_key,
+    })
+    logger.info(response.status_code)
+    return (response.status_code, response.json())
+
+async def verify_email(email):
+    res = await acached("email_verifier", make_key(str(email or "").strip().lower()), settings.email_verifier_cache_ttl_days * DAY,
+                        lambda: _verify_email(email),
+                        store_if=_verification_cacheable, encode=_verification_to_cache)
+    return tuple(res)
+
+async def _verify_email(email):
+    logger.info(f"Called Hunter.io Email Verification API for: {email}")
+    response = await _hunter_get(rate_limiter.HUNTER_EMAIL_VERIFIER, "/email-verifier", {"email": email, "api_key": settings.hunter_api_key}, timeout=30)
+    logger.info(response.status_code)
+    logger.info(response.json())
+    return (response.status_code, response.json())
+
+async def aclose():
+    """Close the shared HTTP connections. Call once when the event loop is done with the module."""
+    await http.aclose()
+    await client.close()
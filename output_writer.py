@@ -0,0 +1,89 @@
+"""
+Crash-safe output files.
+
+atomic_save writes a whole DataFrame through a temp file and a rename, so an output
+file is either the old version or the new one, never half written. RowStream keeps a
+run's rows on disk while they are still being filled in: each finished row is
+appended to a side CSV straight away, and the whole frame is re-saved atomically
+every few seconds, so a killed process loses at most that much work. The final output
+is still saved from the in-memory frame: the side CSV only holds finished rows, so it
+could not rebuild skipped rows or the original column types.
+"""
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_save(df, path):
+    """Write df as CSV or xlsx (by suffix) to a temp file next to path, then rename it over path."""
+    path = Path(path)
+    tmp = path.with_name(f"~{path.stem}.tmp{path.suffix}")
+    try:
+        if path.suffix.lower() == ".csv":
+            df.to_csv(tmp, index=False)
+        else:
+            df.to_excel(tmp, index=False, engine="openpyxl")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class RowStream:
+    """
+    Streams one output DataFrame to disk while a run fills it in.
+    row_done(idx) appends that row to `<partial>.rows.csv` and flushes; every `interval`
+    seconds the whole frame is saved atomically to `partial_path` (never, if interval is None).
+    close() removes the side CSV, and the partial file too unless it is being kept as the run's output.
+    """
+
+    def __init__(self, df, partial_path, interval):
+        self.df = df
+        self.partial_path = Path(partial_path)
+        self.rows_path = self.partial_path.with_name(f"{self.partial_path.stem}.rows.csv")
+        self.interval = interval
+        self._rows_file = None
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def row_done(self, idx):
+        try:
+            if self._rows_file is None:
+                self._rows_file = open(self.rows_path, "w", newline="", encoding="utf-8")
+                self.df.iloc[:0].to_csv(self._rows_file, index_label="row")
+            self.df.loc[[idx]].to_csv(self._rows_file, header=False)
+            self._rows_file.flush()
+        except OSError as e:
+            logger.warning(f"Could not append row {idx} to {self.rows_path.name}: {e}")
+        self._dirty = True
+        if self.interval is not None and time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        """Atomically rewrite the partial output if any row changed since the last save."""
+        if not self._dirty:
+            return
+        try:
+            atomic_save(self.df, self.partial_path)
+            self._dirty = False
+        except Exception as e:  # a locked file or a cell openpyxl refuses (IllegalCharacterError) must not stop the run
+            logger.warning(f"Autosave to {self.partial_path.name} failed: {e}")
+        self._last_save = time.monotonic()
+
+    def close(self, keep_partial=False):
+        """
+        Finish streaming, after the caller has written the final output — or, with keep_partial,
+        save the partial file as the output. The side CSV is only removed once its rows are in a real file.
+        """
+        if keep_partial:
+            self._dirty = True
+            self.save()
+        if self._rows_file is not None:
+            self._rows_file.close()
+            self._rows_file = None
+        if not (keep_partial and self._dirty):
+            self.rows_path.unlink(missing_ok=True)
+        if not keep_partial:
+            self.partial_path.unlink(missing_ok=True)
@@ -0,0 +1,173 @@
+"""
+Population lookups for the Population column.
+
+A local gazetteer (CSV or Parquet of places, state/province and population) answers
+most rows instantly. Earlier LLM answers are reused from the cache, and whatever is
+still missing goes to OpenAI in batches of places instead of one web search per row.
+"""
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import openai
+import pandas as pd
+import openai_hunter_client
+from cache import DAY, cache, make_key
+from presets import stateCorrectionMap
+from settings import settings, get_env_path
+
+logger = logging.getLogger(__name__)
+
+_REGION_CODES = {name: abbr for (abbr, full) in stateCorrectionMap for name in (abbr, full)}
+_PLACE_COLUMNS = ["place", "name", "city", "county", "municipality", "county/city", "city/county", "town"]
+_REGION_COLUMNS = ["state", "province", "region", "state/province", "province/state", "state_code", "province_code"]
+
+
+def region_code(state) -> str:
+    """'FL – Florida', 'Florida', 'fl' -> 'fl'. Unknown regions are returned normalised as-is."""
+    state = str(state or "").strip().lower()
+    state = re.split(r"\s+[–-]\s+", state)[0]
+    return _REGION_CODES.get(state) or _REGION_CODES.get(state[0:2], state)
+
+
+def _normalize_place(name) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", str(name or "").lower()).split())
+
+
+def _place_variants(name):
+    """'Brevard County' -> ['brevard county', 'brevard']; 'City of Calgary' -> ['city of calgary', 'calgary']. Exact form first."""
+    place = _normalize_place(name)
+    variants = [place]
+    for prefix in ("city of ", "town of ", "village of ", "county of "):
+        if place.startswith(prefix):
+            variants.append(place[len(prefix):])
+    for suffix in (" county", " city", " town", " village", " municipal district"):
+        if place.endswith(suffix):
+            variants.append(place[:-len(suffix)])
+    return variants
+
+
+def gazetteer_path():
+    if settings.population_gazetteer_path:
+        return Path(settings.population_gazetteer_path)
+    bundled = get_env_path().parent / "gazetteer.csv"
+    return bundled if bundled.exists() else None
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer(path):
+    """
+    Index a gazetteer file as (exact, stripped): exact maps {(normalized place, region code): population};
+    stripped maps the same places without "County"/"City of"/... and is only a fallback for misses.
+    A stripped name shared by places with different populations (Jefferson County and Jefferson City) maps to None.
+    """
+    path = Path(path)
+    df = pd.read_parquet(path) if path.suffix.lower() == ".parquet" else pd.read_csv(path)
+    lower = {str(c).strip().lower(): c for c in df.columns}
+    place_col = next((lower[c] for c in _PLACE_COLUMNS if c in lower), None)
+    region_col = next((lower[c] for c in _REGION_COLUMNS if c in lower), None)
+    pop_col = next((col for key, col in lower.items() if "population" in key), None)
+    if place_col is None or region_col is None or pop_col is None:
+        logger.warning(f"Gazetteer {path.name} needs place, state/province and population columns — ignoring it")
+        return {}, {}
+    df = df[[place_col, region_col, pop_col]].dropna()
+    exact, stripped = {}, {}
+    for place, region, population in df.itertuples(index=False):
+        try:
+            population = str(int(float(str(population).replace(",", ""))))
+        except ValueError:
+            continue
+        code = region_code(region)
+        place, *bare = _place_variants(place)
+        exact.setdefault((place, code), population)
+        for variant in bare:
+            key = (variant, code)
+            stripped[key] = population if stripped.get(key, population) == population else None
+    logger.info(f"Loaded {len(df)} places from gazetteer {path.name}")
+    return exact, stripped
+
+
+def _gazetteer_population(index, place, code):
+    """An exact match wins; stripped forms of either side are only tried when no exact entry exists."""
+    exact, stripped = index
+    variants = _place_variants(place)
+    for variant in variants:
+        if (variant, code) in exact:
+            return exact[(variant, code)]
+    return next((stripped[(v, code)] for v in variants if stripped.get((v, code))), None)
+
+
+def gazetteer():
+    path = gazetteer_path()
+    if path is None or not path.exists():
+        return {}, {}
+    try:
+        return _load_gazetteer(str(path))
+    except Exception as e:
+        logger.warning(f"Could not read gazetteer {path}: {e}")
+        return {}, {}
+
+
+def _cache_key(place, state):
+    return make_key(_normalize_place(place), region_code(state))
+
+
+def _parse_population(value):
+    try:
+        return str(int(float(str(value).replace(",", "").strip())))
+    except (TypeError, ValueError):
+        return None
+
+
+def resolve(places):
+    """
+    Resolve populations for (place, state) pairs.
+    Returns {(place, state): population string} for every pair that could be resolved.
+    """
+    places = list(dict.fromkeys(places))
+    found = {}
+    index = gazetteer()
+    misses = []
+    for place, state in places:
+        code = region_code(state)
+        population = _gazetteer_population(index, place, code)
+        if population is None and cache is not None:
+            hit, population = cache.get("population", _cache_key(place, state))
+        if population is not None:
+            found[(place, state)] = population
+        else:
+            misses.append((place, state))
+
+    if places:
+        logger.info(f"Population: {len(found)}/{len(places)} resolved locally, {len(misses)} to look up")
+
+    batch_size = max(settings.population_batch_size, 1)
+    batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+
+    def lookup(batch):
+        labels = {f"{place}, {state}".strip(", "): (place, state) for place, state in batch}
+        try:
+            answers = openai_hunter_client.search_population_batch(list(labels))
+            if not isinstance(answers, dict):
+                raise ValueError(f"expected a JSON object, got {type(answers).__name__}")
+        except openai.APIConnectionError:
+            raise
+        except Exception as e:
+            logger.error(f"Population batch lookup failed ({len(batch)} places): {e}")
+            return {}
+        resolved = {}
+        for label, (place, state) in labels.items():
+            population = _parse_population(answers.get(label))
+            if population is None:
+                logger.error(f"Failed to parse population for {label} ({answers.get(label)})")
+                continue
+            resolved[(place, state)] = population
+            if cache is not None:
+                cache.set("population", _cache_key(place, state), population, settings.population_cache_ttl_days * DAY)
+        return resolved
+
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="population") as pool:
+        for resolved in pool.map(lookup, batches):
+            found.update(resolved)
+    return found
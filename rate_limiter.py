@@ -0,0 +1,193 @@
+"""
+Token-bucket scheduler shared by every outbound OpenAI and Hunter.io call.
+
+Each endpoint has its own budget (requests per second or per minute, and tokens per
+minute for OpenAI), configured from Settings. Callers reserve before they send and
+sleep until the reservation is covered, so a run settles at the highest rate the
+account allows instead of bursting into 429s.
+
+On top of the fixed budgets, AIMDLimiter caps how many calls to a provider are in
+flight at once and adapts that cap to what the account actually sustains.
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+import openai
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS = "chat_completions"
+RESPONSES = "responses"
+HUNTER_EMAIL_FINDER = "hunter_email_finder"
+HUNTER_EMAIL_VERIFIER = "hunter_email_verifier"
+HUNTER_DOMAIN_SEARCH = "hunter_domain_search"
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """rate is tokens refilled per second; capacity is the largest burst (defaults to one second's worth)."""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """Take `amount` tokens now and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def _per_minute(n):
+    return TokenBucket(n / 60)
+
+
+_openai_tokens = _per_minute(settings.openai_tokens_per_minute)
+budgets = {
+    CHAT_COMPLETIONS: [_per_minute(settings.openai_requests_per_minute), _openai_tokens],
+    RESPONSES: [_per_minute(settings.responses_requests_per_minute), _openai_tokens],
+    HUNTER_EMAIL_FINDER: [TokenBucket(settings.hunter_finder_requests_per_second)],
+    HUNTER_EMAIL_VERIFIER: [TokenBucket(settings.hunter_verifier_requests_per_second)],
+    HUNTER_DOMAIN_SEARCH: [TokenBucket(settings.hunter_domain_search_requests_per_second)],
+}
+
+
+def _reserve(endpoint, tokens):
+    request_bucket, *token_buckets = budgets[endpoint]
+    delay = request_bucket.reserve(1)
+    for bucket in token_buckets:
+        delay = max(delay, bucket.reserve(tokens))
+    if delay > 1:
+        logger.info(f"Rate limit: waiting {delay:.1f}s for {endpoint}")
+    return delay
+
+
+def acquire(endpoint, tokens=0):
+    """Block until one request (and `tokens` OpenAI tokens) fits in the endpoint's budget."""
+    delay = _reserve(endpoint, tokens)
+    if delay:
+        time.sleep(delay)
+
+
+async def acquire_async(endpoint, tokens=0):
+    delay = _reserve(endpoint, tokens)
+    if delay:
+        await asyncio.sleep(delay)
+
+
+def estimate_tokens(messages, max_tokens):
+    """Rough prompt + completion size used against the tokens-per-minute budget (~4 characters per token)."""
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4 + max_tokens
+
+
+def backoff_seconds(attempt):
+    return min(2 ** (attempt - 1), 10)
+
+
+def backoff(attempt):
+    """Sleep before a retry — a Hunter.io 202 ("still in progress") re-poll or a throttled OpenAI call: 1s, 2s, 4s... capped at 10s."""
+    time.sleep(backoff_seconds(attempt))
+
+
+class Slot:
+    """Handed to the caller inside AIMDLimiter.slot(); set throttled for a 429 that did not raise."""
+    def __init__(self):
+        self.started = time.monotonic()
+        self.throttled = False
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight calls to one provider.
+    Every call that comes back faster than latency_target grows the cap by 1/cap (about +1
+    per full window); an HTTP 429 or openai.RateLimitError cuts it by decrease_factor.
+    429s from calls that started before the last cut are ignored, so one burst only
+    counts once.
+    """
+
+    def __init__(self, name, initial, maximum, latency_target, minimum=1, decrease_factor=0.5):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def level(self):
+        return int(self.limit)
+
+    def _try_acquire(self):
+        with self._cond:
+            if self._in_flight < self.level:
+                self._in_flight += 1
+                return True
+            return False
+
+    def _release(self, slot, error):
+        latency = time.monotonic() - slot.started
+        with self._cond:
+            self._in_flight -= 1
+            before = self.level
+            if slot.throttled:
+                if slot.started >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = time.monotonic()
+            elif not error and latency <= self.latency_target:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            after = self.level
+            self._cond.notify_all()
+        if slot.throttled:
+            logger.warning(f"{self.name} rate limited — concurrency {before} -> {after}")
+        elif after != before:
+            logger.info(f"{self.name} concurrency {before} -> {after} (last call {latency:.1f}s)")
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self._in_flight >= self.level:
+                self._cond.wait()
+            self._in_flight += 1
+        slot = Slot()
+        error = False
+        try:
+            yield slot
+        except openai.RateLimitError:
+            slot.throttled = True
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._release(slot, error)
+
+    @asynccontextmanager
+    async def aslot(self):
+        while not self._try_acquire():
+            await asyncio.sleep(0.05)
+        slot = Slot()
+        error = False
+        try:
+            yield slot
+        except openai.RateLimitError:
+            slot.throttled = True
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._release(slot, error)
+
+
+openai_concurrency = AIMDLimiter("OpenAI", settings.adaptive_concurrency_initial, settings.openai_max_concurrency, settings.openai_latency_target_seconds)
+hunter_concurrency = AIMDLimiter("Hunter.io", settings.adaptive_concurrency_initial, settings.hunter_max_concurrency, settings.hunter_latency_target_seconds)
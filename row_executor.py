@@ -0,0 +1,25 @@
+from collections import deque
+
+
+def run_ordered(pool, items, worker, window):
+    """
+    Run worker(*item) for each item on a shared thread pool and yield (item, result)
+    in the same order the items came in.
+    At most `window` items are in flight at once, so a 3,000-row sheet never queues
+    more than that ahead of the caller. Closing the generator early (break / return /
+    exception) cancels every queued item that has not started yet.
+    """
+    items = iter(items)
+    in_flight = deque()
+    try:
+        for item in items:
+            in_flight.append((item, pool.submit(worker, *item)))
+            if len(in_flight) >= window:
+                item, future = in_flight.popleft()
+                yield item, future.result()
+        while in_flight:
+            item, future = in_flight.popleft()
+            yield item, future.result()
+    finally:
+        for _, future in in_flight:
+            future.cancel()
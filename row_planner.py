@@ -0,0 +1,91 @@
+"""
+Plans a section's work before any API call.
+
+Workbooks often list the same (County/City, State) more than once — in stacked
+sections, across sheets, or simply repeated. The planner normalizes every row's
+entity key, drops rows that would be skipped anyway, and groups the rest so each
+unique entity is searched once and its result copied to every matching row.
+"""
+import threading
+from collections import OrderedDict
+import pandas as pd
+from population import _normalize_place, region_code
+
+
+def entity_key(place, state):
+    """'Brevard County', 'FL – Florida' and 'brevard county', 'fl' are the same entity."""
+    return _normalize_place(place), region_code(state)
+
+
+def mostly_empty(df):
+    """Boolean mask of rows with at most one non-blank cell, computed for the whole frame at once."""
+    return (df.notna() & df.ne("")).sum(axis=1) <= 1
+
+
+class EntityMemo(OrderedDict):
+    """
+    Run-level memo of resolved entities. With maxsize, the least recently used entries are
+    dropped, so a streamed file keeps flat memory however many distinct entities it lists.
+    Role threads share one memo, so look entries up with get() rather than `in` then [].
+    """
+
+    def __init__(self, maxsize=None):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            if self.maxsize and len(self) > self.maxsize:
+                self.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                return self[key]
+            except KeyError:
+                return default
+
+
+class RowPlan:
+    """
+    entities maps entity key -> the row indexes that share it, in sheet order.
+    work lists (key, idx, value, state) for the first row of each entity — the one
+    that is actually searched.
+    """
+
+    def __init__(self):
+        self.entities = {}
+        self.work = []
+        self.skipped = 0
+
+    @property
+    def rows(self):
+        return sum(len(rows) for rows in self.entities.values())
+
+
+def plan_rows(df, place_col, state_col=None, skip=None):
+    """Group the processable rows of df by entity. skip is an optional boolean mask of rows to leave out."""
+    plan = RowPlan()
+    places = df[place_col]
+    states = df[state_col] if state_col else pd.Series("", index=df.index)
+    skip = mostly_empty(df) if skip is None else skip
+    blank = places.isna() | (places.astype(str).str.strip() == "") | (places == place_col)
+    plan.skipped = int((skip & ~blank).sum())
+
+    for idx, value, state in zip(df.index[~(skip | blank)], places[~(skip | blank)], states[~(skip | blank)]):
+        state = "" if pd.isna(state) else str(state)
+        key = entity_key(value, state)
+        if key not in plan.entities:
+            plan.entities[key] = []
+            plan.work.append((key, idx, value, state))
+        plan.entities[key].append(idx)
+    return plan
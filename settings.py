@@ -31,5 +31,57 @@ class Settings(BaseSettings):
     prompt_has_gis_department: str
     prompt_find_outreach_message: str
     file_id: str
+    max_concurrent_rows: int = 16  # upper bound on rows in flight; actual API concurrency adapts (rate_limiter.AIMDLimiter)
+    openai_base_url: str | None = None  # override to point the clients at a proxy or local fake
+    hunter_api_base: str = "https://api.hunter.io/v2"
+    # Outbound rate budgets (see rate_limiter.py)
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200000
+    responses_requests_per_minute: int = 500
+    hunter_finder_requests_per_second: float = 15
+    hunter_verifier_requests_per_second: float = 10
+    hunter_domain_search_requests_per_second: float = 15
+    adaptive_concurrency_initial: int = 4
+    openai_max_concurrency: int = 32
+    hunter_max_concurrency: int = 16
+    openai_latency_target_seconds: float = 30  # search-preview calls normally take 5-20s
+    hunter_latency_target_seconds: float = 5
+    # Persistent answer cache (see cache.py)
+    cache_enabled: bool = True
+    cache_path: str = ""  # defaults to %LOCALAPPDATA%/AI Outreach/cache.sqlite3
+    search_cache_ttl_days: float = 120
+    email_finder_cache_ttl_days: float = 90
+    email_finder_negative_ttl_days: float = 14  # "no email found" answers are retried sooner
+    email_verifier_cache_ttl_days: float = 30
+    domain_cache_ttl_days: float = 365
+    domain_negative_ttl_days: float = 30  # organizations OpenAI could not find a domain for
+    outreach_cache_ttl_days: float = 180
+    domain_search_cache_ttl_days: float = 30
+    # Population lookups (see population.py)
+    population_gazetteer_path: str = ""  # CSV/Parquet of place, state/province, population; defaults to a bundled gazetteer.csv
+    population_batch_size: int = 25
+    population_cache_ttl_days: float = 365
+    # Alberta county lookups (see alberta_tools.lookup_county)
+    county_table_path: str = ""  # optional CSV/Parquet of town, county (and province) used before asking OpenAI
+    county_cache_ttl_days: float = 3650
+    # Checkpoint journal for resuming interrupted runs (see journal.py)
+    journal_path: str = ""  # default: journal.sqlite3 next to the cache
+    journal_retention_days: float = 30
+    # Incremental re-runs keep rows with a sourced email at least this confident, updated within this many days
+    incremental_min_confidence: int = 80
+    incremental_max_age_days: float = 90
+    autosave_seconds: float = 30  # partial outputs are re-saved this often; finished rows also stream to a side CSV immediately
+    # CSV inputs at least this large are streamed chunk by chunk instead of loaded whole (0 turns streaming off)
+    stream_csv_min_mb: float = 50
+    stream_chunk_rows: int = 5000
+    stream_queue_chunks: int = 2  # parsed chunks read ahead, and finished chunks waiting to be written
+    stream_entity_memo_size: int = 20000  # most recently resolved entities kept for reuse across chunks
+    fast_reader: bool = True  # read inputs with calamine (xlsx) / pyarrow (CSV) when installed; falls back to the pandas defaults
+    parsed_file_cache_mb: float = 512  # parsed input files kept in memory so reopening one in another tool skips parsing (0 turns it off)
+    xlsx_header_rows: int = 200  # rows of each .xlsx sheet read up front to find headers and sections; the rest loads when the sheet is reached
+    # Hunter Finder domain grouping (see hunter_finder.py)
+    hunter_domain_group_min_rows: int = 3  # domains with at least this many people use one Domain Search instead of per-person Email Finder calls
+    hunter_domain_search_page_size: int = 100
+    hunter_domain_search_max_emails: int = 500  # emails fetched per domain directory
     model_config = ConfigDict(env_file=get_env_path())
 settings = Settings()
\ No newline at end of file
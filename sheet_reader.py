@@ -0,0 +1,169 @@
+"""
+Input readers shared by main.py and the More Tools windows.
+
+read_csv / read_excel / read_table are drop-in replacements for the pandas readers that
+use a faster engine when it is installed — calamine for workbooks, pyarrow for CSV — and
+fall back to the default engines if it is missing, switched off (FAST_READER=false) or
+cannot read the file. Both paths return the same frame, including the raw header=None
+layout that utilities._split_by_duplicate_headers expects.
+
+pd.read_excel(sheet_name=None) parses every sheet in full before the first row can be
+processed. Workbook opens the file in openpyxl's read-only mode instead: sheet names and
+sizes come from the workbook index, head() streams just the first rows of a sheet for
+header and section detection, and load() parses a whole sheet only once it is needed.
+
+Parsed files are kept in a process-wide cache keyed by path, mtime and size, so opening
+the same file again — in Hunter Finder after selecting it, or in Merge after Hunter
+Finder — skips parsing. Callers get copy-on-write copies and can edit them freely.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, time
+from pathlib import Path
+import openpyxl
+import pandas as pd
+from settings import settings
+
+try:
+    import python_calamine
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+try:
+    import pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+LAZY_EXTENSIONS = {".xlsx", ".xlsm"}
+_PYARROW_UNSUPPORTED = {"chunksize", "iterator", "nrows", "skipfooter", "low_memory"}
+
+_parsed = OrderedDict()  # (path, mtime, size, reader, options) -> (frame or {sheet: frame}, bytes), least recently used first
+_parsed_lock = threading.Lock()
+
+
+def _shallow(result):
+    """Copy-on-write copies, so a caller editing its frame never changes the cached one."""
+    if isinstance(result, dict):
+        return {sheet: df.copy(deep=False) for sheet, df in result.items()}
+    return result.copy(deep=False)
+
+
+def _cached_read(reader, path, kwargs, parse):
+    """parse() once per (path, mtime, size, reader, kwargs); later reads of the unchanged file come from memory."""
+    limit = settings.parsed_file_cache_mb * 1024 * 1024
+    if limit <= 0:
+        return parse()
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size, reader, repr(sorted(kwargs.items())))
+    with _parsed_lock:
+        if key in _parsed:
+            _parsed.move_to_end(key)
+            logger.debug(f"Reusing parsed {Path(path).name}")
+            return _shallow(_parsed[key][0])
+
+    result = parse()
+    frames = result.values() if isinstance(result, dict) else [result]
+    size = int(sum(df.memory_usage(deep=True).sum() for df in frames))
+    if size <= limit:
+        with _parsed_lock:
+            for old in [k for k in _parsed if k[0] == key[0] and k[1:3] != key[1:3]]:
+                del _parsed[old]  # the file has changed since it was cached
+            _parsed[key] = (result, size)
+            total = sum(entry_size for _, entry_size in _parsed.values())
+            while total > limit:
+                _, (_, evicted) = _parsed.popitem(last=False)
+                total -= evicted
+    return _shallow(result)
+
+
+def _restore_text(df, path, kwargs):
+    """pyarrow parses ISO dates and times that the C parser keeps as text; re-read just those columns as text."""
+    temporal = []
+    for i, dtype in enumerate(df.dtypes):
+        sample = df.iloc[:, i].dropna().head(1)
+        if dtype.kind in "Mm" or (dtype == object and not sample.empty and isinstance(sample.iloc[0], (date, time))):
+            temporal.append(i)
+    if temporal:
+        text = pd.read_csv(path, **kwargs, usecols=temporal, dtype=str)
+        for pos, i in enumerate(temporal):
+            df.isetitem(i, text.iloc[:, pos])
+    return df
+
+
+def read_csv(path, fast=None, cached=True, **kwargs):
+    """
+    pd.read_csv, through pyarrow when available. fast=None follows settings.fast_reader;
+    cached=False always parses the file (chunked reads are never cached).
+    """
+    fast = settings.fast_reader if fast is None else fast
+
+    def parse():
+        if fast and HAS_PYARROW and not _PYARROW_UNSUPPORTED & set(kwargs):
+            try:
+                return _restore_text(pd.read_csv(path, engine="pyarrow", **kwargs), path, kwargs)
+            except Exception as e:
+                logger.info(f"pyarrow could not read {Path(path).name}, using the default parser: {e}")
+        return pd.read_csv(path, **kwargs)
+
+    if not cached or {"chunksize", "iterator"} & set(kwargs):
+        return parse()
+    return _cached_read("csv", path, kwargs, parse)
+
+
+def read_excel(path, fast=None, cached=True, **kwargs):
+    """pd.read_excel, through calamine when available. fast and cached work as in read_csv."""
+    fast = settings.fast_reader if fast is None else fast
+
+    def parse():
+        if fast and HAS_CALAMINE:
+            try:
+                return pd.read_excel(path, engine="calamine", **kwargs)
+            except Exception as e:
+                logger.info(f"calamine could not read {Path(path).name}, using openpyxl: {e}")
+        return pd.read_excel(path, **kwargs)
+
+    return _cached_read("excel", path, kwargs, parse) if cached else parse()
+
+
+def read_table(path, fast=None, cached=True, **kwargs):
+    """read_csv or read_excel by file extension."""
+    reader = read_csv if Path(path).suffix.lower() == ".csv" else read_excel
+    return reader(path, fast, cached, **kwargs)
+
+
+class Workbook:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._book = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        self.sheet_names = list(self._book.sheetnames)
+
+    def rows(self, sheet):
+        """
+        Row count from the sheet's stored dimensions (0 if the file does not record them). Formatted
+        but empty cells can stretch the dimensions, so this is an upper bound until the sheet is loaded.
+        """
+        return self._book[sheet].max_row or 0
+
+    def head(self, sheet, rows):
+        """The first `rows` rows of a sheet, shaped like read_excel(header=None) would return them."""
+        values = list(self._book[sheet].iter_rows(max_row=rows, values_only=True))
+        df = pd.DataFrame(values)
+        # Read-only rows run to the stored dimensions; trim the empty tail the way read_excel does
+        filled = df.notna().to_numpy()
+        if not filled.any():
+            return pd.DataFrame()
+        last_row = len(filled) - filled.any(axis=1)[::-1].argmax()
+        last_col = filled.shape[1] - filled.any(axis=0)[::-1].argmax()
+        return df.iloc[:last_row, :last_col]
+
+    def load(self, sheet):
+        return read_excel(self.path, sheet_name=sheet, header=None)
+
+    def close(self):
+        self._book.close()
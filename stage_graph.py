@@ -0,0 +1,42 @@
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class StageGraph:
+    """
+    A tiny dependency graph of named stages for one row.
+    Each stage is fn(results) -> value, where results holds the values of the stages
+    it runs after. A stage starts as soon as everything it depends on has finished,
+    so independent stages overlap and a row takes as long as its longest chain.
+    """
+
+    def __init__(self):
+        self._stages = {}
+
+    def add(self, name, fn, after=()):
+        for dep in after:
+            if dep not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self._stages[name] = (fn, tuple(after))
+        return self
+
+    def run(self, pool):
+        """Run every stage on `pool` and return {name: value}. The first stage error is re-raised."""
+        results = {}
+        waiting = dict(self._stages)
+        running = {}
+
+        def submit_ready():
+            for name, (fn, after) in list(waiting.items()):
+                if all(dep in results for dep in after):
+                    del waiting[name]
+                    deps = {dep: results[dep] for dep in after}
+                    running[pool.submit(fn, deps)] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+            submit_ready()
+        return results